@@ -3,16 +3,20 @@
 Analytics API endpoints for GPS Dashboard
 """
 
+import os
+import time
 from datetime import datetime
 from typing import Dict, Any, List
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from services.analytics_service import AnalyticsService
 
 
 class StorageAnalytics(BaseModel):
     """Storage analytics data model"""
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
     total_size_mb: float
     data_points: int
     daily_growth_mb: float
@@ -22,6 +26,8 @@ class StorageAnalytics(BaseModel):
 
 class GrowthProjection(BaseModel):
     """Growth projection data model"""
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
     period: str
     size_mb: float
     size_gb: float
@@ -30,6 +36,8 @@ class GrowthProjection(BaseModel):
 
 class QueueStorageInfo(BaseModel):
     """Per-queue storage information"""
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
     name: str
     category: str
     data_points: int
@@ -44,7 +52,30 @@ class AnalyticsAPI:
     def __init__(self, analytics_service: AnalyticsService):
         self.analytics_service = analytics_service
         self.router = APIRouter()
+
+        # Short-lived response cache: analytics change on the order of
+        # minutes, so concurrent dashboard refreshes share one backend query
+        self._cache: Dict[str, Any] = {}
+        self._cache_time: Dict[str, float] = {}
+        self._cache_ttl = int(os.getenv("ANALYTICS_CACHE_TTL", 60))
+
         self._setup_routes()
+
+    async def _cached(self, key: str, factory):
+        """Return cached result for key, refreshing it when the TTL expires"""
+        now = time.monotonic()
+        if key in self._cache and now - self._cache_time.get(key, 0) < self._cache_ttl:
+            return self._cache[key]
+
+        value = await factory()
+        self._cache[key] = value
+        self._cache_time[key] = now
+        return value
+
+    def _clear_cache(self):
+        """Drop all cached analytics responses"""
+        self._cache.clear()
+        self._cache_time.clear()
     
     def _setup_routes(self):
         """Setup API routes"""
@@ -53,25 +84,35 @@ class AnalyticsAPI:
         async def get_storage_analytics() -> Dict[str, Any]:
             """Get comprehensive storage analytics"""
             try:
-                analytics = await self.analytics_service.get_storage_analytics()
+                analytics = await self._cached("storage", self.analytics_service.get_storage_analytics)
                 return analytics
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
         
-        @self.router.get("/analytics/queues")
-        async def get_queue_analytics() -> List[QueueStorageInfo]:
+        # Data is already in canonical shape; skip response-model validation
+        # and keep the Pydantic models for OpenAPI docs only
+        @self.router.get(
+            "/analytics/queues",
+            response_model=None,
+            responses={200: {"model": List[QueueStorageInfo]}}
+        )
+        async def get_queue_analytics():
             """Get per-queue storage breakdown"""
             try:
-                queue_analytics = await self.analytics_service.get_queue_storage_breakdown()
+                queue_analytics = await self._cached("queues", self.analytics_service.get_queue_storage_breakdown)
                 return queue_analytics
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
         
-        @self.router.get("/analytics/growth")
-        async def get_growth_projections() -> List[GrowthProjection]:
+        @self.router.get(
+            "/analytics/growth",
+            response_model=None,
+            responses={200: {"model": List[GrowthProjection]}}
+        )
+        async def get_growth_projections():
             """Get storage growth projections"""
             try:
-                projections = await self.analytics_service.get_growth_projections()
+                projections = await self._cached("growth", self.analytics_service.get_growth_projections)
                 return projections
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
@@ -80,7 +121,7 @@ class AnalyticsAPI:
         async def get_storage_breakdown() -> Dict[str, Any]:
             """Get storage component breakdown"""
             try:
-                breakdown = await self.analytics_service.get_storage_breakdown()
+                breakdown = await self._cached("breakdown", self.analytics_service.get_storage_breakdown)
                 return breakdown
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
@@ -92,7 +133,10 @@ class AnalyticsAPI:
                 if days < 1 or days > 365:
                     raise HTTPException(status_code=400, detail="Days must be between 1 and 365")
                 
-                trends = await self.analytics_service.get_usage_trends(days)
+                trends = await self._cached(
+                    f"trends_{days}",
+                    lambda: self.analytics_service.get_usage_trends(days)
+                )
                 return trends
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
@@ -101,6 +145,7 @@ class AnalyticsAPI:
         async def refresh_analytics() -> Dict[str, str]:
             """Manually refresh analytics cache"""
             try:
+                self._clear_cache()
                 await self.analytics_service.refresh_cache()
                 return {
                     "status": "success",
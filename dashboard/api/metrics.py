@@ -3,16 +3,40 @@
 Metrics API endpoints for GPS Dashboard
 """
 
+import hashlib
+
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+import orjson
+from pydantic import BaseModel, ConfigDict
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 from services.metrics_service import MetricsService
 
+async def _zstd_stream(chunks):
+    """Compress an async byte stream with zstd as it is produced"""
+    compressor = zstandard.ZstdCompressor(level=3).compressobj()
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+# Hoisted lookup tables so request handlers don't rebuild them per call
+_EXPORT_FORMATS = frozenset({"csv", "json"})
+
 
 class QueueMetrics(BaseModel):
     """Queue metrics data model"""
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
     queue_name: str
     category: str
     timestamp: datetime
@@ -30,6 +54,20 @@ class MetricsAPI:
         self.router = APIRouter()
         self._setup_routes()
     
+    def _conditional_response(self, request: Request, payload) -> Response:
+        """Serialize payload once and answer 304 when the client ETag matches"""
+        body = orjson.dumps(payload)
+        etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304)
+
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"ETag": etag, "Cache-Control": "max-age=2"}
+        )
+
     def _setup_routes(self):
         """Setup API routes"""
         
@@ -50,11 +88,7 @@ class MetricsAPI:
         ) -> Dict[str, Any]:
             """Get time series metrics for specific queue"""
             try:
-                # Auto-select resolution based on time range
-                if not resolution:
-                    resolution_map = {"1h": "1m", "8h": "5m", "1d": "15m"}
-                    resolution = resolution_map.get(time_range, "5m")
-                
+                # Resolution defaults server-side to a chart-sized window
                 metrics = await self.metrics_service.get_queue_timeseries(
                     queue_name, time_range, resolution
                 )
@@ -63,26 +97,25 @@ class MetricsAPI:
                 raise HTTPException(status_code=500, detail=str(e))
         
         @self.router.get("/queues/current")
-        async def get_current_metrics() -> List[QueueMetrics]:
+        async def get_current_metrics(request: Request):
             """Get current metrics for all queues"""
             try:
                 current_metrics = await self.metrics_service.get_current_metrics()
-                return current_metrics
+                return self._conditional_response(request, current_metrics)
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
         
         @self.router.get("/metrics/table")
         async def get_table_data(
-            from_time: Optional[str] = None,
-            to_time: Optional[str] = None,
+            from_time: Optional[datetime] = None,
+            to_time: Optional[datetime] = None,
             limit: int = Query(1000, ge=1, le=10000)
         ) -> Dict[str, Any]:
             """Get tabular metrics data for specified time range"""
             try:
-                # Parse time parameters
+                # FastAPI already parsed the timestamps (including 'Z' suffix)
                 if from_time and to_time:
-                    start_time = datetime.fromisoformat(from_time.replace('Z', '+00:00'))
-                    end_time = datetime.fromisoformat(to_time.replace('Z', '+00:00'))
+                    start_time, end_time = from_time, to_time
                 else:
                     # Default to last 24 hours
                     end_time = datetime.utcnow()
@@ -92,46 +125,50 @@ class MetricsAPI:
                     start_time, end_time, limit
                 )
                 return table_data
-            except ValueError as e:
-                raise HTTPException(status_code=400, detail=f"Invalid time format: {e}")
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
         
         @self.router.get("/metrics/export/{format}")
         async def export_metrics(
             format: str,
-            from_time: Optional[str] = None,
-            to_time: Optional[str] = None
+            request: Request,
+            from_time: Optional[datetime] = None,
+            to_time: Optional[datetime] = None
         ):
             """Export metrics data in specified format"""
             try:
-                if format not in ["csv", "json"]:
+                if format not in _EXPORT_FORMATS:
                     raise HTTPException(status_code=400, detail="Format must be 'csv' or 'json'")
                 
-                # Parse time parameters
+                # FastAPI already parsed the timestamps (including 'Z' suffix)
                 if from_time and to_time:
-                    start_time = datetime.fromisoformat(from_time.replace('Z', '+00:00'))
-                    end_time = datetime.fromisoformat(to_time.replace('Z', '+00:00'))
+                    start_time, end_time = from_time, to_time
                 else:
                     # Default to last 7 days
                     end_time = datetime.utcnow()
                     start_time = end_time - timedelta(days=7)
                 
-                if format == "csv":
-                    return await self.metrics_service.export_csv(start_time, end_time)
-                else:
-                    return await self.metrics_service.export_json(start_time, end_time)
-                    
-            except ValueError as e:
-                raise HTTPException(status_code=400, detail=f"Invalid time format: {e}")
+                # Stream rows as they arrive from InfluxDB instead of
+                # buffering the whole export in memory
+                stream = self.metrics_service.iter_export_rows(start_time, end_time, format)
+                media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+                headers = {"Content-Disposition": f"attachment; filename=metrics.{format}"}
+
+                # CSV compresses ~10x; use zstd when the client supports it
+                accept_encoding = request.headers.get("accept-encoding", "")
+                if zstandard and "zstd" in accept_encoding:
+                    stream = _zstd_stream(stream)
+                    headers["Content-Encoding"] = "zstd"
+
+                return StreamingResponse(stream, media_type=media_type, headers=headers)
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
         
         @self.router.get("/system/overview")
-        async def get_system_overview() -> Dict[str, Any]:
+        async def get_system_overview(request: Request):
             """Get system-wide metrics overview"""
             try:
                 overview = await self.metrics_service.get_system_overview()
-                return overview
+                return self._conditional_response(request, overview)
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -6,9 +6,9 @@ Handles real-time data streaming and connection management
 
 import asyncio
 import logging
-from typing import List, Dict, Any
+from typing import Dict, Any, Set
 from fastapi import WebSocket, WebSocketDisconnect
-import json
+import orjson
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -18,20 +18,20 @@ class WebSocketManager:
     """Manages WebSocket connections and real-time data broadcasting"""
     
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
         self.broadcasting = False
         self.broadcast_task = None
     
     async def connect(self, websocket: WebSocket):
         """Accept new WebSocket connection"""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
     
     def disconnect(self, websocket: WebSocket):
         """Remove WebSocket connection"""
         if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+            self.active_connections.discard(websocket)
             logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
     
     async def disconnect_all(self):
@@ -48,6 +48,15 @@ class WebSocketManager:
         
         if self.broadcast_task:
             self.broadcast_task.cancel()
+            try:
+                # Await the task so cancellation actually completes instead
+                # of leaking the coroutine across reloads
+                await self.broadcast_task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.error(f"Error awaiting broadcast task: {e}")
+            self.broadcast_task = None
     
     async def send_personal_message(self, message: str, websocket: WebSocket):
         """Send message to specific WebSocket"""
@@ -62,33 +71,28 @@ class WebSocketManager:
         if not self.active_connections:
             return
         
-        message_str = json.dumps(message)
-        disconnected = []
-        
-        for websocket in self.active_connections:
-            try:
-                await websocket.send_text(message_str)
-            except Exception as e:
-                logger.error(f"Error broadcasting message: {e}")
-                disconnected.append(websocket)
-        
+        # Serialize once (orjson handles datetimes natively), so each
+        # client send skips re-serialization. Text frames, not binary:
+        # the frontend JSON.parses event.data and would receive a Blob
+        # from a binary frame
+        payload = orjson.dumps(message).decode()
+
+        # Fan out concurrently so one slow client doesn't delay the
+        # others. The list() snapshot is taken without awaiting, so
+        # connect/disconnect on the same event loop can't mutate the set
+        # mid-iteration; no lock needed, and a stalled send never blocks
+        # the next broadcast behind it
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(websocket.send_text(payload) for websocket in connections),
+            return_exceptions=True
+        )
+
         # Remove disconnected websockets
-        for websocket in disconnected:
-            self.disconnect(websocket)
-    
-    async def send_metrics_update(self, websocket: WebSocket):
-        """Send metrics update to specific WebSocket"""
-        try:
-            # This would normally fetch current metrics
-            # For now, send a keep-alive message
-            message = {
-                "type": "ping",
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            await websocket.send_text(json.dumps(message))
-        except Exception as e:
-            logger.error(f"Error sending metrics update: {e}")
-            self.disconnect(websocket)
+        for websocket, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error broadcasting message: {result}")
+                self.disconnect(websocket)
     
     async def start_broadcasting(self):
         """Start background broadcasting task"""
@@ -104,10 +108,11 @@ class WebSocketManager:
         try:
             while self.broadcasting:
                 if self.active_connections:
-                    # Send periodic updates to all connections
+                    # Single fan-out point: one message construction per
+                    # interval regardless of connection count
                     message = {
                         "type": "system_heartbeat",
-                        "timestamp": datetime.utcnow().isoformat(),
+                        "timestamp": datetime.utcnow(),
                         "active_connections": len(self.active_connections)
                     }
                     await self.broadcast_message(message)
@@ -124,7 +129,7 @@ class WebSocketManager:
         message = {
             "type": "queue_discovered",
             "payload": queue_info,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
         await self.broadcast_message(message)
     
@@ -133,7 +138,7 @@ class WebSocketManager:
         message = {
             "type": "system_alert",
             "payload": alert,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
         await self.broadcast_message(message)
     
@@ -7,14 +7,17 @@ FastAPI backend serving web interface and APIs
 import os
 import asyncio  # FIX: Missing import
 import logging
+import time
 from datetime import datetime
 from typing import Dict, Any, List
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import uvicorn
 
 # Import dashboard services
@@ -38,6 +41,33 @@ websocket_manager = None
 metrics_api = None
 analytics_api = None
 
+# Health probe cache: orchestrators poll /health aggressively, so the
+# InfluxDB ping result is reused for a few seconds instead of per request
+_HEALTH_PROBE_TTL = 5.0
+_health_probe = {"checked_at": 0.0, "healthy": False}
+_health_probe_lock = asyncio.Lock()
+
+
+async def _influx_healthy() -> bool:
+    """Check InfluxDB health, coalescing concurrent probes behind a TTL"""
+    now = time.monotonic()
+    if now - _health_probe["checked_at"] < _HEALTH_PROBE_TTL:
+        return _health_probe["healthy"]
+
+    async with _health_probe_lock:
+        # Another probe may have refreshed while we waited on the lock
+        now = time.monotonic()
+        if now - _health_probe["checked_at"] < _HEALTH_PROBE_TTL:
+            return _health_probe["healthy"]
+
+        healthy = False
+        if metrics_service:
+            healthy = await metrics_service.health_check()
+
+        _health_probe["checked_at"] = time.monotonic()
+        _health_probe["healthy"] = healthy
+        return healthy
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -46,7 +76,13 @@ async def lifespan(app: FastAPI):
     
     # Startup
     logger.info("Starting GPS Dashboard...")
-    
+
+    # Size the default executor so blocking work offloaded via
+    # asyncio.to_thread / run_in_executor doesn't starve under load
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 2))
+    )
+
     try:
         # Initialize services
         metrics_service = MetricsService()
@@ -64,8 +100,11 @@ async def lifespan(app: FastAPI):
         app.include_router(metrics_api.router, prefix="/api", tags=["metrics"])
         app.include_router(analytics_api.router, prefix="/api", tags=["analytics"])
         
-        # Start background tasks
-        asyncio.create_task(websocket_manager.start_broadcasting())
+        # Start background tasks (keep the reference so failures surface
+        # and the task can be awaited at shutdown)
+        app.state.broadcast_bootstrap = asyncio.create_task(
+            websocket_manager.start_broadcasting()
+        )
         
         logger.info("GPS Dashboard startup complete")
         
@@ -88,6 +127,10 @@ async def lifespan(app: FastAPI):
         # Disconnect all WebSocket connections
         if websocket_manager:
             await websocket_manager.disconnect_all()
+
+        bootstrap = getattr(app.state, "broadcast_bootstrap", None)
+        if bootstrap:
+            await asyncio.wait_for(bootstrap, timeout=5)
         
         logger.info("GPS Dashboard shutdown complete")
         
@@ -102,18 +145,28 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# CORS middleware
+# CORS middleware - explicit allowlist lets browsers cache preflights
+cors_origins = [
+    origin.strip()
+    for origin in os.getenv("DASHBOARD_CORS_ORIGINS", "").split(",")
+    if origin.strip()
+]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=cors_origins or ["http://localhost:3000"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
 
+# Compress large JSON/CSV responses; level 5 balances ratio against CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -128,15 +181,13 @@ async def root():
 async def health_check():
     """Health check endpoint"""
     try:
-        # Check InfluxDB connection
-        influx_healthy = False
-        if metrics_service:
-            influx_healthy = await metrics_service.health_check()
+        # Check InfluxDB connection (cached for a few seconds)
+        influx_healthy = await _influx_healthy()
         
         return {
             "status": "healthy" if influx_healthy else "degraded",
             "service": "gps-dashboard",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
             "version": "1.0.0",
             "components": {
                 "influxdb": "healthy" if influx_healthy else "unhealthy",
@@ -152,7 +203,7 @@ async def health_check():
             "status": "unhealthy",
             "service": "gps-dashboard",
             "error": str(e),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
 
 
@@ -166,9 +217,9 @@ async def websocket_endpoint(websocket: WebSocket):
     await websocket_manager.connect(websocket)
     try:
         while True:
-            # Keep connection alive and send periodic updates
-            await websocket_manager.send_metrics_update(websocket)
-            await asyncio.sleep(15)  # Match collection interval
+            # Park on inbound frames; liveness is handled by the
+            # protocol-level PING configured on the server
+            await websocket.receive_text()
             
     except WebSocketDisconnect:
         websocket_manager.disconnect(websocket)
@@ -182,14 +233,32 @@ if __name__ == "__main__":
     host = os.getenv("DASHBOARD_HOST", "0.0.0.0")
     port = int(os.getenv("DASHBOARD_PORT", 8000))
     debug = os.getenv("DASHBOARD_DEBUG", "false").lower() == "true"
-    
+    workers = int(os.getenv("DASHBOARD_WORKERS", 1))
+
+    if workers > 1:
+        # Each worker process holds its own WebSocketManager, so broadcasts
+        # only reach the clients connected to the same worker. Cross-worker
+        # fan-out needs an external pub/sub broker (e.g. Redis).
+        logger.warning(
+            f"Running with {workers} workers: WebSocket broadcasts are "
+            f"per-worker; clients on other workers will not receive them"
+        )
+
     logger.info(f"Starting GPS Dashboard on {host}:{port}")
-    
-    # Run server
+
+    # Run server (uvloop + httptools from uvicorn[standard] for C-based
+    # event loop and HTTP parsing; workers are incompatible with reload)
     uvicorn.run(
         "app:app",
         host=host,
         port=port,
         reload=debug,
+        workers=1 if debug else workers,
+        loop="uvloop",
+        http="httptools",
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
+        ws_ping_interval=20,
+        ws_ping_timeout=20,
         log_level="info"
     )
\ No newline at end of file
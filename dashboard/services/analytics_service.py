@@ -5,10 +5,12 @@ Handles storage analytics, growth projections, and system insights
 """
 
 import os
+import time
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 from influxdb_client import InfluxDBClient
 from influxdb_client.client.query_api import QueryApi
@@ -16,6 +18,30 @@ from influxdb_client.client.query_api import QueryApi
 logger = logging.getLogger(__name__)
 
 
+def _scalar(result, default=0):
+    """Extract the single value from an aggregated Flux result"""
+    if result and result[0].records:
+        value = result[0].records[0].get_value()
+        return value if value is not None else default
+    return default
+
+
+# Projection horizons, computed once at import
+_PROJECTION_PERIODS = (("1 Month", 30), ("6 Months", 180), ("1 Year", 365))
+
+# Average storage cost of one data point; keep in sync with the Flux
+# map() conversions that return MB directly
+BYTES_PER_POINT = 25
+_BYTES_PER_MB = 1024 * 1024
+
+
+def _project_size(current_size_mb: float, daily_growth_mb: float, days: int):
+    """Pure numeric projection kernel: (size_mb, size_gb, additional_mb)"""
+    additional = daily_growth_mb * days
+    size_mb = current_size_mb + additional
+    return round(size_mb, 2), round(size_mb / 1024, 3), round(additional, 2)
+
+
 class AnalyticsService:
     """Service for handling analytics and storage insights"""
     
@@ -29,11 +55,16 @@ class AnalyticsService:
         # Client instances
         self.client = None
         self.query_api = None
-        
+        self._pool = None
+        self._flux = {}
+
         # Analytics cache
         self.cache = {}
         self.cache_ttl = 300  # 5 minutes
         self.last_cache_update = {}
+
+        # Per-queue category memo: queue_name -> (monotonic ts, category)
+        self._category_cache = {}
     
     async def initialize(self):
         """Initialize InfluxDB client"""
@@ -42,11 +73,152 @@ class AnalyticsService:
                 url=self.url,
                 token=self.token,
                 org=self.org,
-                timeout=30000
+                timeout=30000,
+                enable_gzip=True,
+                # Default urllib3 pool (~10) serializes gather-driven
+                # concurrency; size it to match the executor fan-out
+                connection_pool_maxsize=32
             )
             
             self.query_api = self.client.query_api()
-            
+
+            # The Influx client is synchronous; queries run on this pool so
+            # they don't block the event loop
+            self._pool = ThreadPoolExecutor(max_workers=8)
+
+            # Static Flux texts compiled once; bind values arrive as
+            # extern option variables via query(params=...), referenced
+            # by bare name, so the query strings stay stable across
+            # calls and queue_name can't inject Flux
+            self._flux = {
+                "db_size": '''
+                import "influxdata/influxdb/monitor"
+
+                monitor.from(start: -5m)
+                    |> filter(fn: (r) => r._measurement == "influxdb_database")
+                    |> filter(fn: (r) => r._field == "numBytes")
+                    |> filter(fn: (r) => r.bucket == bucket)
+                    |> last()
+                ''',
+                "total_points": '''
+                from(bucket: bucket)
+                    |> range(start: -30d)
+                    |> filter(fn: (r) => r._measurement == "queue_metrics")
+                    |> count()
+                    |> group()
+                    |> sum()
+                ''',
+                "daily_growth": '''
+                from(bucket: bucket)
+                    |> range(start: -7d)
+                    |> filter(fn: (r) => r._measurement == "queue_metrics")
+                    |> aggregateWindow(every: 1d, fn: count)
+                    |> sum()
+                    |> mean()
+                    |> map(fn: (r) => ({ r with _value: float(v: r._value) * 25.0 / 1048576.0 }))
+                ''',
+                "daily_points": '''
+                from(bucket: bucket)
+                    |> range(start: -24h)
+                    |> filter(fn: (r) => r._measurement == "queue_metrics")
+                    |> count()
+                    |> group()
+                    |> sum()
+                ''',
+                "queue_category": '''
+                from(bucket: bucket)
+                    |> range(start: -24h)
+                    |> filter(fn: (r) => r._measurement == "queue_metrics")
+                    |> filter(fn: (r) => r.queue_name == qn)
+                    |> keep(columns: ["category"])
+                    |> last()
+                ''',
+                "last_activity": '''
+                from(bucket: bucket)
+                    |> range(start: -7d)
+                    |> filter(fn: (r) => r._measurement == "queue_metrics")
+                    |> filter(fn: (r) => r.queue_name == qn)
+                    |> last()
+                    |> keep(columns: ["_time"])
+                ''',
+                "queue_count": '''
+                import "influxdata/influxdb/schema"
+
+                schema.tagValues(
+                    bucket: bucket,
+                    tag: "queue_name",
+                    predicate: (r) => r._measurement == "queue_metrics" and r._time >= -24h
+                )
+                    |> count()
+                ''',
+                "bulk": '''
+                import "influxdata/influxdb/monitor"
+                import "influxdata/influxdb/schema"
+
+                monitor.from(start: -5m)
+                    |> filter(fn: (r) => r._measurement == "influxdb_database")
+                    |> filter(fn: (r) => r._field == "numBytes")
+                    |> filter(fn: (r) => r.bucket == bucket)
+                    |> last()
+                    |> yield(name: "db_bytes")
+
+                from(bucket: bucket)
+                    |> range(start: -30d)
+                    |> filter(fn: (r) => r._measurement == "queue_metrics")
+                    |> count()
+                    |> group()
+                    |> sum()
+                    |> yield(name: "points_30d")
+
+                from(bucket: bucket)
+                    |> range(start: -7d)
+                    |> filter(fn: (r) => r._measurement == "queue_metrics")
+                    |> aggregateWindow(every: 1d, fn: count)
+                    |> sum()
+                    |> mean()
+                    |> yield(name: "daily_points")
+
+                from(bucket: bucket)
+                    |> range(start: -24h)
+                    |> filter(fn: (r) => r._measurement == "queue_metrics")
+                    |> count()
+                    |> group()
+                    |> sum()
+                    |> yield(name: "points_24h")
+
+                schema.tagValues(
+                    bucket: bucket,
+                    tag: "queue_name",
+                    predicate: (r) => r._measurement == "queue_metrics" and r._time >= -24h
+                )
+                    |> count()
+                    |> yield(name: "queue_count")
+                ''',
+                "queue_breakdown": '''
+                data = from(bucket: bucket)
+                    |> range(start: -30d)
+                    |> filter(fn: (r) => r._measurement == "queue_metrics")
+                    |> group(columns: ["queue_name"])
+
+                counts = data
+                    |> count()
+                    |> group()
+
+                counts
+                    |> sort(columns: ["_value"], desc: true)
+                    |> yield(name: "counts")
+
+                counts
+                    |> sum()
+                    |> yield(name: "total")
+
+                data
+                    |> last()
+                    |> keep(columns: ["queue_name", "category", "_time"])
+                    |> yield(name: "meta")
+                '''
+            }
+
             # Test connection
             health = self.client.health()
             if health.status != "pass":
@@ -58,18 +230,76 @@ class AnalyticsService:
             logger.error(f"Failed to initialize AnalyticsService: {e}")
             raise
     
+    async def _cached(self, key: str, factory):
+        """Return the cached value for key while it is younger than cache_ttl"""
+        ts = self.last_cache_update.get(key, 0)
+        if time.monotonic() - ts < self.cache_ttl and key in self.cache:
+            return self.cache[key]
+
+        value = await factory()
+        # The compute methods return an error/fallback payload on
+        # failure; serve it to this caller but don't pin a transient
+        # Influx outage for the whole TTL - the next request retries
+        if not (isinstance(value, dict) and "error" in value):
+            self.cache[key] = value
+            self.last_cache_update[key] = time.monotonic()
+        return value
+
+    async def _aquery(self, query: str, params: Optional[Dict[str, Any]] = None):
+        """Run a blocking InfluxDB query on the thread pool"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._pool, lambda: self.query_api.query(query, params=params)
+        )
+
+    async def _collect_bulk_metrics(self) -> Dict[str, float]:
+        """Run the combined Flux script and index scalar results by yield name"""
+        result = await self._aquery(self._flux["bulk"], {"bucket": self.bucket})
+
+        values: Dict[str, float] = {}
+        for table in result:
+            for record in table.records:
+                name = record.values.get("result")
+                if name and name not in values:
+                    values[name] = record.get_value() or 0
+        return values
+
     async def get_storage_analytics(self) -> Dict[str, Any]:
+        """Get comprehensive storage analytics (cached)"""
+        return await self._cached("storage_analytics", self._compute_storage_analytics)
+
+    async def _compute_storage_analytics(self) -> Dict[str, Any]:
         """Get comprehensive storage analytics"""
         try:
-            # Get basic metrics
-            current_size = await self.get_database_size()
-            data_points = await self.get_total_data_points()
-            daily_growth = await self.calculate_daily_growth()
-            queue_stats = await self.get_queue_statistics()
-            
-            # Calculate projections
-            projections = await self.calculate_storage_projections(daily_growth)
-            
+            # Stamp once up front; cached hits keep the timestamp the
+            # result was computed with
+            now_iso = datetime.utcnow().isoformat()
+
+            # One round trip to InfluxDB instead of one per metric
+            bulk = await self._collect_bulk_metrics()
+
+            data_points = int(bulk.get("points_30d", 0))
+            if "db_bytes" in bulk:
+                current_size = bulk["db_bytes"] / _BYTES_PER_MB
+            else:
+                # Estimate based on data points (~25 bytes per point)
+                current_size = (data_points * BYTES_PER_POINT) / _BYTES_PER_MB
+
+            daily_growth = (bulk.get("daily_points", 0) * BYTES_PER_POINT) / _BYTES_PER_MB
+
+            daily_points_24h = int(bulk.get("points_24h", 0))
+            collections_per_minute = daily_points_24h / (24 * 60) if daily_points_24h > 0 else 0
+            queue_stats = {
+                "active_queues": int(bulk.get("queue_count", 0)),
+                "collections_per_minute": round(collections_per_minute, 2)
+            }
+
+            # Derive projections and breakdown from the already-fetched size,
+            # overlapping any remaining I/O instead of awaiting serially
+            projections, breakdown = await asyncio.gather(
+                self.calculate_storage_projections(daily_growth, current_size),
+                self.get_storage_breakdown(current_size)
+            )
+
             return {
                 "current_usage": {
                     "total_size_mb": current_size,
@@ -83,11 +313,15 @@ class AnalyticsService:
                     "weekly_mb": daily_growth * 7,
                     "monthly_mb": daily_growth * 30
                 },
-                "projections": projections,
-                "breakdown": await self.get_storage_breakdown(),
-                "last_updated": datetime.utcnow().isoformat()
+                # Keep the keyed dict shape at this boundary; the canonical
+                # form is the list calculate_storage_projections returns
+                "projections": {
+                    p["period"].lower().replace(" ", "_"): p for p in projections
+                },
+                "breakdown": breakdown,
+                "last_updated": now_iso
             }
-            
+
         except Exception as e:
             logger.error(f"Error getting storage analytics: {e}")
             return {
@@ -102,29 +336,23 @@ class AnalyticsService:
             }
     
     async def get_database_size(self) -> float:
+        """Get InfluxDB storage size in MB (cached)"""
+        return await self._cached("database_size", self._compute_database_size)
+
+    async def _compute_database_size(self) -> float:
         """Get InfluxDB storage size in MB"""
         try:
             # Method 1: Try InfluxDB system monitoring
-            query = f'''
-            import "influxdata/influxdb/monitor"
-            
-            monitor.from(start: -5m)
-                |> filter(fn: (r) => r._measurement == "influxdb_database")
-                |> filter(fn: (r) => r._field == "numBytes")
-                |> filter(fn: (r) => r.bucket == "{self.bucket}")
-                |> last()
-            '''
-            
-            result = self.query_api.query(query)
+            result = await self._aquery(self._flux["db_size"], {"bucket": self.bucket})
             
             for table in result:
                 for record in table.records:
                     bytes_size = record.get_value()
-                    return bytes_size / (1024 * 1024)  # Convert to MB
+                    return bytes_size / _BYTES_PER_MB  # Convert to MB
             
             # Method 2: Estimate based on data points
             data_points = await self.get_total_data_points()
-            estimated_mb = (data_points * 25) / (1024 * 1024)  # ~25 bytes per point
+            estimated_mb = (data_points * BYTES_PER_POINT) / _BYTES_PER_MB
             
             return estimated_mb
             
@@ -133,24 +361,17 @@ class AnalyticsService:
             return 0.0
     
     async def get_total_data_points(self) -> int:
+        """Get total number of data points stored (cached)"""
+        return await self._cached("total_data_points", self._compute_total_data_points)
+
+    async def _compute_total_data_points(self) -> int:
         """Get total number of data points stored"""
         try:
-            query = f'''
-            from(bucket: "{self.bucket}")
-                |> range(start: -30d)
-                |> filter(fn: (r) => r._measurement == "queue_metrics")
-                |> count()
-                |> sum()
-            '''
-            
-            result = self.query_api.query(query)
-            
-            total_points = 0
-            for table in result:
-                for record in table.records:
-                    total_points += record.get_value()
-            
-            return total_points
+            result = await self._aquery(self._flux["total_points"], {"bucket": self.bucket})
+
+            # group() merged the per-series counts before sum(), so the
+            # result is a single scalar table
+            return int(_scalar(result))
             
         except Exception as e:
             logger.error(f"Error getting total data points: {e}")
@@ -160,53 +381,21 @@ class AnalyticsService:
         """Calculate average daily storage growth in MB"""
         try:
             # Get data points for last 7 days
-            query = f'''
-            from(bucket: "{self.bucket}")
-                |> range(start: -7d)
-                |> filter(fn: (r) => r._measurement == "queue_metrics")
-                |> aggregateWindow(every: 1d, fn: count)
-                |> sum()
-                |> mean()
-            '''
-            
-            result = self.query_api.query(query)
-            
-            daily_points = 0
-            for table in result:
-                for record in table.records:
-                    daily_points = record.get_value()
-                    break
-            
-            # Convert to MB (assuming ~25 bytes per point)
-            daily_mb = (daily_points * 25) / (1024 * 1024)
-            
-            return daily_mb
+            result = await self._aquery(self._flux["daily_growth"], {"bucket": self.bucket})
             
+            # The Flux map() already converted points to MB; _scalar
+            # defaults to 0 on an empty window, so no fallback query
+            return float(_scalar(result))
+
         except Exception as e:
             logger.error(f"Error calculating daily growth: {e}")
-            # Fallback calculation
-            current_points = await self.get_current_daily_points()
-            estimated_mb_per_point = 0.000025  # ~25 bytes per point
-            return current_points * estimated_mb_per_point
+            return 0.0
     
     async def get_current_daily_points(self) -> int:
         """Get current daily data point collection rate"""
         try:
-            query = f'''
-            from(bucket: "{self.bucket}")
-                |> range(start: -24h)
-                |> filter(fn: (r) => r._measurement == "queue_metrics")
-                |> count()
-                |> sum()
-            '''
-            
-            result = self.query_api.query(query)
-            
-            for table in result:
-                for record in table.records:
-                    return record.get_value()
-            
-            return 0
+            result = await self._aquery(self._flux["daily_points"], {"bucket": self.bucket})
+            return int(_scalar(result))
             
         except Exception as e:
             logger.error(f"Error getting current daily points: {e}")
@@ -215,24 +404,11 @@ class AnalyticsService:
     async def get_queue_statistics(self) -> Dict[str, Any]:
         """Get queue-related statistics"""
         try:
-            # Get unique queues in last 24 hours
-            queue_query = f'''
-            import "influxdata/influxdb/schema"
-            
-            schema.tagValues(
-                bucket: "{self.bucket}",
-                tag: "queue_name",
-                predicate: (r) => r._measurement == "queue_metrics" and r._time >= -24h
-            )
-            '''
-            
-            queue_result = self.query_api.query(queue_query)
-            
-            queue_count = 0
-            for table in queue_result:
-                for record in table.records:
-                    queue_count += 1
-            
+            # Count unique queues on the server so only one scalar row
+            # comes back instead of a row per queue name
+            queue_result = await self._aquery(self._flux["queue_count"], {"bucket": self.bucket})
+            queue_count = int(_scalar(queue_result))
+
             # Calculate collection rate
             daily_points = await self.get_current_daily_points()
             collections_per_minute = daily_points / (24 * 60) if daily_points > 0 else 0
@@ -251,38 +427,45 @@ class AnalyticsService:
                 "estimated_interval_seconds": 0
             }
     
-    async def calculate_storage_projections(self, daily_growth_mb: float) -> Dict[str, Any]:
-        """Calculate storage growth projections"""
+    async def calculate_storage_projections(
+        self,
+        daily_growth_mb: float,
+        current_size_mb: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Calculate storage growth projections from a known current size"""
         try:
-            current_size = await self.get_database_size()
-            
-            return {
-                "1_month": {
-                    "size_mb": round(current_size + (daily_growth_mb * 30), 2),
-                    "size_gb": round((current_size + (daily_growth_mb * 30)) / 1024, 3),
-                    "additional_mb": round(daily_growth_mb * 30, 2)
-                },
-                "6_months": {
-                    "size_mb": round(current_size + (daily_growth_mb * 180), 2),
-                    "size_gb": round((current_size + (daily_growth_mb * 180)) / 1024, 3),
-                    "additional_mb": round(daily_growth_mb * 180, 2)
-                },
-                "1_year": {
-                    "size_mb": round(current_size + (daily_growth_mb * 365), 2),
-                    "size_gb": round((current_size + (daily_growth_mb * 365)) / 1024, 3),
-                    "additional_mb": round(daily_growth_mb * 365, 2)
-                }
-            }
-            
+            # Reuse the caller's size when it already fetched one
+            if current_size_mb is not None:
+                current_size = current_size_mb
+            else:
+                current_size = await self.get_database_size()
+
+            projections = []
+            for period, days in _PROJECTION_PERIODS:
+                # Each product is computed exactly once inside _project_size
+                size_mb, size_gb, additional_mb = _project_size(
+                    current_size, daily_growth_mb, days
+                )
+                projections.append({
+                    "period": period,
+                    "size_mb": size_mb,
+                    "size_gb": size_gb,
+                    "additional_mb": additional_mb
+                })
+            return projections
+
         except Exception as e:
             logger.error(f"Error calculating projections: {e}")
-            return {}
+            return []
     
-    async def get_storage_breakdown(self) -> Dict[str, Any]:
-        """Get storage component breakdown"""
+    async def get_storage_breakdown(self, total_size_mb: Optional[float] = None) -> Dict[str, Any]:
+        """Get storage component breakdown for a known total size"""
         try:
-            total_size = await self.get_database_size()
-            
+            if total_size_mb is not None:
+                total_size = total_size_mb
+            else:
+                total_size = await self.get_database_size()
+
             # Estimate breakdown (InfluxDB typical ratios)
             metrics_data = total_size * 0.75  # 75% actual data
             indexes = total_size * 0.15       # 15% indexes
@@ -309,75 +492,58 @@ class AnalyticsService:
             return {}
     
     async def get_queue_storage_breakdown(self) -> List[Dict[str, Any]]:
+        """Get per-queue storage breakdown (cached)"""
+        return await self._cached("queue_storage_breakdown", self._compute_queue_storage_breakdown)
+
+    async def _compute_queue_storage_breakdown(self) -> List[Dict[str, Any]]:
         """Get per-queue storage breakdown"""
         try:
-            # Get all queues and their data point counts
-            queues_data = []
-            
-            # Get unique queues
-            queue_query = f'''
-            import "influxdata/influxdb/schema"
-            
-            schema.tagValues(
-                bucket: "{self.bucket}",
-                tag: "queue_name",
-                predicate: (r) => r._measurement == "queue_metrics" and r._time >= -30d
-            )
-            '''
-            
-            queue_result = self.query_api.query(queue_query)
-            queue_names = []
-            
-            for table in queue_result:
+            # One grouped query returns per-queue counts (already sorted
+            # descending), the grand total, and last-seen metadata, so the
+            # Python side does no summing or sorting of its own
+            result = await self._aquery(self._flux["queue_breakdown"], {"bucket": self.bucket})
+
+            ordered_counts: List[tuple] = []
+            total_points = 0
+            meta: Dict[str, Dict[str, Any]] = {}
+            for table in result:
                 for record in table.records:
-                    queue_names.append(record.get_value())
-            
-            # Get data points per queue
-            for queue_name in queue_names:
-                try:
-                    point_query = f'''
-                    from(bucket: "{self.bucket}")
-                        |> range(start: -30d)
-                        |> filter(fn: (r) => r._measurement == "queue_metrics")
-                        |> filter(fn: (r) => r.queue_name == "{queue_name}")
-                        |> count()
-                        |> sum()
-                    '''
-                    
-                    point_result = self.query_api.query(point_query)
-                    data_points = 0
-                    
-                    for table in point_result:
-                        for record in table.records:
-                            data_points = record.get_value()
-                            break
-                    
-                    # Get queue category and last activity
-                    category = await self.get_queue_category(queue_name)
-                    last_activity = await self.get_queue_last_activity(queue_name)
-                    
-                    # Estimate storage (~25 bytes per point)
-                    estimated_mb = (data_points * 25) / (1024 * 1024)
-                    
-                    queues_data.append({
-                        "name": queue_name,
-                        "category": category,
-                        "data_points": data_points,
-                        "estimated_size_mb": round(estimated_mb, 2),
-                        "last_activity": last_activity
-                    })
-                    
-                except Exception as e:
-                    logger.error(f"Error processing queue {queue_name}: {e}")
-                    continue
-            
-            # Calculate percentages
-            total_size = sum(q["estimated_size_mb"] for q in queues_data)
-            for queue in queues_data:
-                queue["percentage"] = round((queue["estimated_size_mb"] / total_size) * 100, 1) if total_size > 0 else 0
-            
-            # Sort by size (descending)
-            return sorted(queues_data, key=lambda x: x["estimated_size_mb"], reverse=True)
+                    yield_name = record.values.get("result")
+                    if yield_name == "total":
+                        total_points = int(record.get_value() or 0)
+                        continue
+
+                    queue_name = record.values.get("queue_name")
+                    if not queue_name:
+                        continue
+                    if yield_name == "counts":
+                        ordered_counts.append((queue_name, int(record.get_value() or 0)))
+                    else:
+                        last_time = record.get_time()
+                        meta[queue_name] = {
+                            "category": record.values.get("category", "SUPPORT"),
+                            "last_activity": last_time.isoformat() if last_time else None
+                        }
+
+            # Rows arrive pre-sorted by the Flux sort; point share equals
+            # size share since the per-point estimate is constant
+            queues_data = []
+            for queue_name, data_points in ordered_counts:
+                info = meta.get(queue_name, {})
+
+                # Estimate storage (~25 bytes per point)
+                estimated_mb = round((data_points * BYTES_PER_POINT) / _BYTES_PER_MB, 2)
+
+                queues_data.append({
+                    "name": queue_name,
+                    "category": info.get("category", "SUPPORT"),
+                    "data_points": data_points,
+                    "estimated_size_mb": estimated_mb,
+                    "percentage": round((data_points / total_points) * 100, 1) if total_points > 0 else 0,
+                    "last_activity": info.get("last_activity")
+                })
+
+            return queues_data
             
         except Exception as e:
             logger.error(f"Error getting queue storage breakdown: {e}")
@@ -385,24 +551,26 @@ class AnalyticsService:
     
     async def get_queue_category(self, queue_name: str) -> str:
         """Get queue category"""
+        # Categories rarely change; serve from the memo within cache_ttl
+        ts, cached = self._category_cache.get(queue_name, (0, None))
+        if cached is not None and time.monotonic() - ts < self.cache_ttl:
+            return cached
+
         try:
-            query = f'''
-            from(bucket: "{self.bucket}")
-                |> range(start: -24h)
-                |> filter(fn: (r) => r._measurement == "queue_metrics")
-                |> filter(fn: (r) => r.queue_name == "{queue_name}")
-                |> keep(columns: ["category"])
-                |> last()
-            '''
-            
-            result = self.query_api.query(query)
-            
+            result = await self._aquery(
+                self._flux["queue_category"],
+                {"bucket": self.bucket, "qn": queue_name}
+            )
+
+            category = 'SUPPORT'
             for table in result:
                 for record in table.records:
-                    return record.values.get('category', 'SUPPORT')
-            
-            return 'SUPPORT'
-            
+                    category = record.values.get('category', 'SUPPORT')
+                    break
+
+            self._category_cache[queue_name] = (time.monotonic(), category)
+            return category
+
         except Exception as e:
             logger.debug(f"Could not get category for {queue_name}: {e}")
             return 'SUPPORT'
@@ -410,16 +578,10 @@ class AnalyticsService:
     async def get_queue_last_activity(self, queue_name: str) -> Optional[str]:
         """Get last activity timestamp for queue"""
         try:
-            query = f'''
-            from(bucket: "{self.bucket}")
-                |> range(start: -7d)
-                |> filter(fn: (r) => r._measurement == "queue_metrics")
-                |> filter(fn: (r) => r.queue_name == "{queue_name}")
-                |> last()
-                |> keep(columns: ["_time"])
-            '''
-            
-            result = self.query_api.query(query)
+            result = await self._aquery(
+                self._flux["last_activity"],
+                {"bucket": self.bucket, "qn": queue_name}
+            )
             
             for table in result:
                 for record in table.records:
@@ -434,30 +596,16 @@ class AnalyticsService:
     async def get_growth_projections(self) -> List[Dict[str, Any]]:
         """Get growth projections as list"""
         daily_growth = await self.calculate_daily_growth()
-        projections = await self.calculate_storage_projections(daily_growth)
-        
-        return [
-            {
-                "period": "1 Month",
-                "size_mb": projections["1_month"]["size_mb"],
-                "size_gb": projections["1_month"]["size_gb"],
-                "additional_mb": projections["1_month"]["additional_mb"]
-            },
-            {
-                "period": "6 Months", 
-                "size_mb": projections["6_months"]["size_mb"],
-                "size_gb": projections["6_months"]["size_gb"],
-                "additional_mb": projections["6_months"]["additional_mb"]
-            },
-            {
-                "period": "1 Year",
-                "size_mb": projections["1_year"]["size_mb"],
-                "size_gb": projections["1_year"]["size_gb"],
-                "additional_mb": projections["1_year"]["additional_mb"]
-            }
-        ]
+        return await self.calculate_storage_projections(daily_growth)
     
     async def get_usage_trends(self, days: int = 30) -> Dict[str, Any]:
+        """Get usage trends over specified period (cached per window)"""
+        return await self._cached(
+            f"usage_trends_{days}",
+            lambda: self._compute_usage_trends(days)
+        )
+
+    async def _compute_usage_trends(self, days: int = 30) -> Dict[str, Any]:
         """Get usage trends over specified period"""
         try:
             query = f'''
@@ -469,20 +617,26 @@ class AnalyticsService:
                 |> map(fn: (r) => ({{ r with _value: float(v: r._value) * 25.0 / 1024.0 / 1024.0 }}))
             '''
             
-            result = self.query_api.query(query)
-            
-            trend_data = []
-            for table in result:
-                for record in table.records:
-                    trend_data.append({
-                        "date": record.get_time().date().isoformat(),
+            def _stream_trends():
+                # query_stream yields records one at a time, skipping the
+                # intermediate FluxTable materialization for large windows
+                return [
+                    {
+                        "date": record.get_time().strftime("%Y-%m-%d"),
                         "size_mb": round(record.get_value(), 2)
-                    })
-            
+                    }
+                    for record in self.query_api.query_stream(query)
+                ]
+
+            trend_data = await asyncio.get_running_loop().run_in_executor(
+                self._pool, _stream_trends
+            )
+
             return {
                 "period_days": days,
                 "data_points": len(trend_data),
-                "trends": sorted(trend_data, key=lambda x: x["date"])
+                # aggregateWindow already returns time-ordered rows
+                "trends": trend_data
             }
             
         except Exception as e:
@@ -496,9 +650,11 @@ class AnalyticsService:
             health = self.client.health()
             influx_healthy = health.status == "pass"
             
-            # Get basic stats
-            total_size = await self.get_database_size()
-            data_points = await self.get_total_data_points()
+            # Get basic stats concurrently
+            total_size, data_points = await asyncio.gather(
+                self.get_database_size(),
+                self.get_total_data_points()
+            )
             
             return {
                 "status": "healthy" if influx_healthy else "degraded",
@@ -522,6 +678,7 @@ class AnalyticsService:
             # Clear existing cache
             self.cache.clear()
             self.last_cache_update.clear()
+            self._category_cache.clear()
             
             # Trigger cache refresh by calling main analytics
             await self.get_storage_analytics()
@@ -534,6 +691,9 @@ class AnalyticsService:
     
     async def close(self):
         """Close InfluxDB client connections"""
+        if self._pool:
+            self._pool.shutdown(wait=False)
+            self._pool = None
         if self.client:
             self.client.close()
             logger.info("AnalyticsService client closed")
\ No newline at end of file
@@ -5,6 +5,8 @@ Handles InfluxDB queries and data processing
 """
 
 import os
+import time
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
@@ -12,15 +14,91 @@ import csv
 import json
 from io import StringIO
 
-from influxdb_client import InfluxDBClient
-from influxdb_client.client.query_api import QueryApi
+import orjson
+
+from influxdb_client.client.influxdb_client_async import InfluxDBClientAsync
 
 logger = logging.getLogger(__name__)
 
 
+# Static Flux templates, formatted once at import; per-call values bind
+# as extern option variables via query(params=...), referenced by bare
+# name, so query strings stay stable and queue_name can't inject Flux
+_QUEUE_LIST_Q = '''
+from(bucket: bucket)
+    |> range(start: -24h)
+    |> filter(fn: (r) => r._measurement == "queue_metrics")
+    |> group(columns: ["queue_name", "category"])
+    |> last()
+    |> keep(columns: ["_time", "queue_name", "category"])
+'''
+
+_TIMESERIES_Q = '''
+base = from(bucket: bucket)
+    |> range(start: duration(v: rng))
+    |> filter(fn: (r) => r._measurement == "queue_metrics")
+    |> filter(fn: (r) => r.queue_name == qn)
+
+means = base
+    |> filter(fn: (r) => r._field == "messages_ready" or
+                         r._field == "incoming_rate" or
+                         r._field == "consume_rate")
+    |> aggregateWindow(every: duration(v: res), fn: mean, createEmpty: false)
+    |> fill(column: "_value", usePrevious: true)
+
+consumers = base
+    |> filter(fn: (r) => r._field == "consumer_count")
+    |> aggregateWindow(every: duration(v: res), fn: last, createEmpty: false)
+    |> fill(column: "_value", usePrevious: true)
+
+union(tables: [means, consumers])
+    |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+'''
+
+_EXPORT_Q = '''
+from(bucket: bucket)
+    |> range(start: start, stop: stop)
+    |> filter(fn: (r) => r._measurement == "queue_metrics")
+    |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+'''
+
+_CURRENT_METRICS_Q = '''
+from(bucket: bucket)
+    |> range(start: -1h)
+    |> filter(fn: (r) => r._measurement == "queue_metrics")
+    |> group(columns: ["queue_name", "category"])
+    |> last()
+    |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+'''
+
+_CATEGORY_Q = '''
+from(bucket: bucket)
+    |> range(start: -24h)
+    |> filter(fn: (r) => r._measurement == "queue_metrics")
+    |> filter(fn: (r) => r.queue_name == qn)
+    |> keep(columns: ["category"])
+    |> last()
+'''
+
+_LAST_ACTIVITY_Q = '''
+from(bucket: bucket)
+    |> range(start: -7d)
+    |> filter(fn: (r) => r._measurement == "queue_metrics")
+    |> filter(fn: (r) => r.queue_name == qn)
+    |> last()
+    |> keep(columns: ["_time"])
+'''
+
+
 class MetricsService:
     """Service for handling metrics data operations"""
-    
+
+    __slots__ = (
+        "url", "token", "org", "bucket",
+        "client", "query_api",
+        "queue_cache", "cache_ttl", "last_cache_update", "_category_locks"
+    )
+
     def __init__(self):
         # InfluxDB connection settings
         self.url = os.getenv('INFLUXDB_URL', 'http://localhost:8086')
@@ -36,38 +114,43 @@ class MetricsService:
         self.queue_cache = {}
         self.cache_ttl = 300  # 5 minutes
         self.last_cache_update = {}
+        self._category_locks = {}
     
     async def initialize(self):
         """Initialize InfluxDB client"""
         try:
-            self.client = InfluxDBClient(
+            # Async client: queries suspend on the event loop instead of
+            # blocking the ASGI worker
+            self.client = InfluxDBClientAsync(
                 url=self.url,
                 token=self.token,
                 org=self.org,
-                timeout=30000
+                timeout=30000,
+                enable_gzip=True,
+                # Size the pool for dashboard concurrency (multiple tabs,
+                # auto-refresh) instead of the default ~10
+                connection_pool_maxsize=50
             )
-            
+
             self.query_api = self.client.query_api()
-            
+
             # Test connection
-            health = self.client.health()
-            if health.status != "pass":
-                raise Exception(f"InfluxDB health check failed: {health.status}")
-            
+            if not await self.client.ping():
+                raise Exception("InfluxDB ping failed")
+
             logger.info(f"MetricsService initialized successfully: {self.url}")
-            
+
         except Exception as e:
             logger.error(f"Failed to initialize MetricsService: {e}")
             raise
-    
+
     async def health_check(self) -> bool:
         """Check InfluxDB connection health"""
         try:
             if not self.client:
                 return False
-            
-            health = self.client.health()
-            return health.status == "pass"
+
+            return await self.client.ping()
         except Exception as e:
             logger.error(f"Health check failed: {e}")
             return False
@@ -75,34 +158,28 @@ class MetricsService:
     async def get_all_queues(self) -> List[Dict[str, Any]]:
         """Get list of all monitored queues"""
         try:
-            query = f'''
-            import "influxdata/influxdb/schema"
-            
-            schema.tagValues(
-                bucket: "{self.bucket}",
-                tag: "queue_name",
-                predicate: (r) => r._measurement == "queue_metrics" and r._time >= -24h
-            )
-            '''
-            
-            result = self.query_api.query(query)
-            
+            # Group by queue and take the last record so names, categories,
+            # and last-seen times all arrive in one round trip instead of
+            # two extra queries per queue
+            result = await self.query_api.query(_QUEUE_LIST_Q, params={"bucket": self.bucket})
+
             queues = []
+            seen = set()
             for table in result:
                 for record in table.records:
-                    queue_name = record.get_value()
-                    
-                    # Get additional queue info
-                    category = await self.get_queue_category(queue_name)
-                    last_seen = await self.get_queue_last_activity(queue_name)
-                    
+                    queue_name = record.values.get("queue_name")
+                    if not queue_name or queue_name in seen:
+                        continue
+                    seen.add(queue_name)
+
+                    last_seen = record.get_time()
                     queues.append({
                         "name": queue_name,
-                        "category": category,
+                        "category": record.values.get("category", "SUPPORT"),
                         "last_seen": last_seen,
                         "status": "active" if last_seen else "inactive"
                     })
-            
+
             # Sort: CORE first, then alphabetically
             return sorted(queues, key=lambda q: (0 if q['category'] == 'CORE' else 1, q['name']))
             
@@ -111,64 +188,73 @@ class MetricsService:
             return []
     
     async def get_queue_timeseries(
-        self, 
-        queue_name: str, 
-        time_range: str, 
-        resolution: str = "5m"
+        self,
+        queue_name: str,
+        time_range: str,
+        resolution: Optional[str] = None,
+        target_points: int = 300
     ) -> Dict[str, Any]:
         """Get time series data for specific queue"""
         try:
             # Map time ranges
-            range_map = {"1h": "1h", "8h": "8h", "1d": "24h"}
-            influx_range = range_map.get(time_range, "8h")
-            
-            # Base query for all metrics
-            base_query = f'''
-            from(bucket: "{self.bucket}")
-                |> range(start: -{influx_range})
-                |> filter(fn: (r) => r._measurement == "queue_metrics")
-                |> filter(fn: (r) => r.queue_name == "{queue_name}")
-                |> aggregateWindow(every: {resolution}, fn: mean, createEmpty: false)
-                |> fill(column: "_value", usePrevious: true)
-            '''
-            
-            # Get ready messages
-            ready_query = base_query + '|> filter(fn: (r) => r._field == "messages_ready")'
-            ready_result = self.query_api.query(ready_query)
-            
-            # Get rates
-            incoming_query = base_query + '|> filter(fn: (r) => r._field == "incoming_rate")'
-            incoming_result = self.query_api.query(incoming_query)
-            
-            consume_query = base_query + '|> filter(fn: (r) => r._field == "consume_rate")'
-            consume_result = self.query_api.query(consume_query)
-            
-            # Get consumer count (use last value, not mean)
-            consumer_query = f'''
-            from(bucket: "{self.bucket}")
-                |> range(start: -{influx_range})
-                |> filter(fn: (r) => r._measurement == "queue_metrics")
-                |> filter(fn: (r) => r.queue_name == "{queue_name}")
-                |> filter(fn: (r) => r._field == "consumer_count")
-                |> aggregateWindow(every: {resolution}, fn: last, createEmpty: false)
-                |> fill(column: "_value", usePrevious: true)
-            '''
-            consumer_result = self.query_api.query(consumer_query)
-            
-            # Process results
-            ready_data = self._process_timeseries_result(ready_result)
-            incoming_data = self._process_timeseries_result(incoming_result)
-            consume_data = self._process_timeseries_result(consume_result)
-            consumer_data = self._process_timeseries_result(consumer_result)
-            
+            range_map = {"1h": "-1h", "8h": "-8h", "1d": "-24h"}
+            influx_range = range_map.get(time_range, "-8h")
+
+            if not resolution:
+                # Downsample at the source: size the window so the chart
+                # gets ~target_points rows regardless of the range
+                range_seconds = {"1h": 3600, "8h": 28800, "1d": 86400}.get(time_range, 28800)
+                resolution = f"{max(5, range_seconds // target_points)}s"
+
+            # One pivoted query replaces the previous four round trips;
+            # the category lookup overlaps it instead of running after
+            result, category = await asyncio.gather(
+                self.query_api.query(_TIMESERIES_Q, params={
+                    "bucket": self.bucket,
+                    "rng": influx_range,
+                    "qn": queue_name,
+                    "res": resolution
+                }),
+                self.get_queue_category(queue_name)
+            )
+
+            # The pivot aligns timestamps natively, so one pass fills all
+            # three series without any merge step
+            ready_data = []
+            rate_data = []
+            consumer_data = []
+            for table in result:
+                for record in table.records:
+                    # Read the values dict directly; get_time()/get_value()
+                    # are just lookups into it with extra call overhead
+                    values = record.values
+                    timestamp = values["_time"].isoformat()
+
+                    ready = values.get("messages_ready")
+                    if ready is not None:
+                        ready_data.append({"timestamp": timestamp, "value": ready})
+
+                    incoming = values.get("incoming_rate")
+                    consume = values.get("consume_rate")
+                    if incoming is not None or consume is not None:
+                        rate_data.append({
+                            "timestamp": timestamp,
+                            "incoming_rate": incoming if incoming is not None else 0.0,
+                            "consume_rate": consume if consume is not None else 0.0
+                        })
+
+                    consumers = values.get("consumer_count")
+                    if consumers is not None:
+                        consumer_data.append({"timestamp": timestamp, "value": consumers})
+
             return {
                 "queue_name": queue_name,
-                "category": await self.get_queue_category(queue_name),
+                "category": category,
                 "time_range": time_range,
                 "resolution": resolution,
                 "data": {
                     "ready_messages": ready_data,
-                    "rates": self._combine_rate_data(incoming_data, consume_data),
+                    "rates": rate_data,
                     "consumers": consumer_data
                 }
             }
@@ -181,49 +267,43 @@ class MetricsService:
                 "data": {"ready_messages": [], "rates": [], "consumers": []}
             }
     
-    def _process_timeseries_result(self, result) -> List[Dict[str, Any]]:
-        """Process InfluxDB query result into time series data"""
-        data = []
-        for table in result:
-            for record in table.records:
-                data.append({
-                    "timestamp": record.get_time().isoformat(),
-                    "value": record.get_value()
-                })
-        return data
-    
-    def _combine_rate_data(self, incoming_data: List, consume_data: List) -> List[Dict[str, Any]]:
-        """Combine incoming and consume rate data"""
-        # Create timestamp-indexed dictionaries
-        incoming_dict = {item["timestamp"]: item["value"] for item in incoming_data}
-        consume_dict = {item["timestamp"]: item["value"] for item in consume_data}
-        
-        # Get all unique timestamps
-        all_timestamps = sorted(set(incoming_dict.keys()) | set(consume_dict.keys()))
-        
-        combined = []
-        for timestamp in all_timestamps:
-            combined.append({
-                "timestamp": timestamp,
-                "incoming_rate": incoming_dict.get(timestamp, 0.0),
-                "consume_rate": consume_dict.get(timestamp, 0.0)
-            })
-        
-        return combined
-    
+    async def iter_export_rows(self, start_time: datetime, end_time: datetime, format: str = "csv"):
+        """Stream export rows as encoded bytes (CSV lines or NDJSON)"""
+        params = {"bucket": self.bucket, "start": start_time, "stop": end_time}
+
+        columns = ["queue_name", "category", "messages_ready", "consumer_count",
+                   "incoming_rate", "consume_rate"]
+        header = ["timestamp"] + columns
+
+        if format == "csv":
+            # csv.writer handles RFC 4180 quoting - queue names may
+            # legally contain commas or quotes; one buffer is reused
+            # per row
+            buf = StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(header)
+            yield buf.getvalue().encode()
+
+        # query_stream yields records one at a time instead of buffering
+        # the whole result set in memory
+        records = await self.query_api.query_stream(_EXPORT_Q, params=params)
+        async for record in records:
+            row = {"timestamp": record.get_time().isoformat()}
+            for column in columns:
+                row[column] = record.values.get(column, "")
+
+            if format == "csv":
+                buf.seek(0)
+                buf.truncate()
+                writer.writerow([row[c] for c in header])
+                yield buf.getvalue().encode()
+            else:
+                yield orjson.dumps(row) + b"\n"
+
     async def get_current_metrics(self) -> List[Dict[str, Any]]:
         """Get current metrics for all queues"""
         try:
-            query = f'''
-            from(bucket: "{self.bucket}")
-                |> range(start: -1h)
-                |> filter(fn: (r) => r._measurement == "queue_metrics")
-                |> group(columns: ["queue_name", "category"])
-                |> last()
-                |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
-            '''
-            
-            result = self.query_api.query(query)
+            result = await self.query_api.query(_CURRENT_METRICS_Q, params={"bucket": self.bucket})
             
             current_metrics = []
             for table in result:
@@ -238,6 +318,12 @@ class MetricsService:
                         "consume_rate": float(record.values.get("consume_rate", 0.0))
                     }
                     current_metrics.append(metrics)
+
+                    # Keep the category cache consistent with fresher data
+                    name = metrics["queue_name"]
+                    if self.queue_cache.get(name) != metrics["category"]:
+                        self.queue_cache[name] = metrics["category"]
+                        self.last_cache_update[name] = time.monotonic()
             
             return current_metrics
             
@@ -246,42 +332,41 @@ class MetricsService:
             return []
     
     async def get_queue_category(self, queue_name: str) -> str:
-        """Get queue category from latest data"""
-        try:
-            query = f'''
-            from(bucket: "{self.bucket}")
-                |> range(start: -24h)
-                |> filter(fn: (r) => r._measurement == "queue_metrics")
-                |> filter(fn: (r) => r.queue_name == "{queue_name}")
-                |> keep(columns: ["category"])
-                |> last()
-            '''
-            
-            result = self.query_api.query(query)
-            
-            for table in result:
-                for record in table.records:
-                    return record.values.get('category', 'SUPPORT')
-            
-            return 'SUPPORT'  # Default
-            
-        except Exception as e:
-            logger.debug(f"Could not get category for {queue_name}: {e}")
-            return 'SUPPORT'
+        """Get queue category from latest data (cached for cache_ttl)"""
+        if time.monotonic() - self.last_cache_update.get(queue_name, 0) < self.cache_ttl:
+            return self.queue_cache.get(queue_name, 'SUPPORT')
+
+        # Per-queue lock so concurrent misses trigger one fetch, not many
+        lock = self._category_locks.setdefault(queue_name, asyncio.Lock())
+        async with lock:
+            if time.monotonic() - self.last_cache_update.get(queue_name, 0) < self.cache_ttl:
+                return self.queue_cache.get(queue_name, 'SUPPORT')
+
+            try:
+                result = await self.query_api.query(
+                    _CATEGORY_Q, params={"bucket": self.bucket, "qn": queue_name}
+                )
+
+                category = 'SUPPORT'  # Default
+                for table in result:
+                    for record in table.records:
+                        category = record.values.get('category', 'SUPPORT')
+                        break
+
+                self.queue_cache[queue_name] = category
+                self.last_cache_update[queue_name] = time.monotonic()
+                return category
+
+            except Exception as e:
+                logger.debug(f"Could not get category for {queue_name}: {e}")
+                return 'SUPPORT'
     
     async def get_queue_last_activity(self, queue_name: str) -> Optional[datetime]:
         """Get last activity timestamp for queue"""
         try:
-            query = f'''
-            from(bucket: "{self.bucket}")
-                |> range(start: -7d)
-                |> filter(fn: (r) => r._measurement == "queue_metrics")
-                |> filter(fn: (r) => r.queue_name == "{queue_name}")
-                |> last()
-                |> keep(columns: ["_time"])
-            '''
-            
-            result = self.query_api.query(query)
+            result = await self.query_api.query(
+                _LAST_ACTIVITY_Q, params={"bucket": self.bucket, "qn": queue_name}
+            )
             
             for table in result:
                 for record in table.records:
@@ -296,5 +381,5 @@ class MetricsService:
     async def close(self):
         """Close InfluxDB client connections"""
         if self.client:
-            self.client.close()
+            await self.client.close()
             logger.info("MetricsService client closed")
\ No newline at end of file
@@ -4,44 +4,119 @@ Discord Alert Sender for Production GPS Queue Monitoring
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from datetime import datetime
 from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
 
+# Lookup tables built once at import instead of per alert
+_SEVERITY_COLORS = {
+    "critical": 0xFF0000,  # Red
+    "warning": 0xFFA500,   # Orange
+    "info": 0x00FF00,      # Green
+    "resolved": 0x00FF00   # Green
+}
+
+_SEVERITY_LABELS = {
+    "critical": "CRITICAL",
+    "warning": "WARNING",
+    "info": "INFO"
+}
+
+# Alert types that get the rabbit emoji instead of the rotating light
+_RABBIT_TYPES = frozenset({
+    "recovery",
+    "system_recovery",
+    "connection_recovered",
+    "system_startup",
+    "configuration_change"
+})
+
+# Embed context fields as (alert_data key, label, formatter, inline);
+# the Severity field slots between the head and tail groups
+_FIELD_SPEC_HEAD = (
+    ("queue", "Queue", lambda v: f"`{v}`", True),
+    ("value", "Value", str, True),
+)
+
+_FIELD_SPEC_TAIL = (
+    ("queue_category", "Category", str, True),
+    ("threshold", "Threshold", str, True),
+    ("system_health", "System Health", str, True),
+    ("target_system", "Target System", str, True),
+    ("monitoring_mode", "Mode", str.title, True),
+)
+
+
 class DiscordAlertSender:
     """Handles Discord webhook notifications for GPS monitoring alerts"""
-    
+
     def __init__(self, webhook_url: str):
         self.webhook_url = webhook_url
         self.bot_name = "Rabbit Queue Alert"
         self.avatar_url = "https://cdn-icons-png.flaticon.com/128/7441/7441511.png"
-        
+
+        # Keep the webhook connection warm; a fresh TCP+TLS handshake per
+        # alert dominates latency during alert storms
+        self._session = requests.Session()
+        self._session.headers.update({"Content-Type": "application/json"})
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=10,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                # Honor Discord's Retry-After on 429 instead of the
+                # exponential schedule; POST isn't retried by default
+                respect_retry_after_header=True,
+                allowed_methods=["POST"]
+            )
+        ))
+
+        # Single worker keeps alerts ordered while posts happen off the
+        # monitoring loop
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+        # Footer dicts keyed by system name; the handful of distinct
+        # systems means each footer is built once, not per embed
+        self._footer_cache = {}
+
+        # Coalescing buffer: one webhook POST carries up to 10 embeds,
+        # flushed on size or after the batch window elapses
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._flush_timer = None
+        self._batch_window = 1.0  # seconds
+        self._max_embeds = 10  # Discord webhook limit per POST
+        # Bound the buffer so a long Discord outage during an alert
+        # storm can't grow memory without limit; oldest embeds drop first
+        self._max_pending = 256
+
         if not webhook_url:
             logger.warning("Discord webhook URL not provided - alerts will be disabled")
     
     def get_color_by_severity(self, severity: str) -> int:
         """Get Discord embed color based on severity"""
-        colors = {
-            "critical": 0xFF0000,  # Red
-            "warning": 0xFFA500,   # Orange  
-            "info": 0x00FF00,      # Green
-            "resolved": 0x00FF00   # Green
-        }
-        return colors.get(severity.lower(), 0x808080)  # Gray default
-    
+        return _SEVERITY_COLORS.get(severity.lower(), 0x808080)  # Gray default
+
     def get_alert_icon(self, alert_type: str, severity: str, status: str = "firing") -> str:
         """Get appropriate icon for alert type and severity"""
-        # Recovery/resolved alerts use rabbit emoji
-        if alert_type in ["recovery", "system_recovery", "connection_recovered"] or status == "resolved":
+        # Recovery/startup/config alerts use the rabbit emoji
+        if alert_type in _RABBIT_TYPES or status == "resolved":
             return "🐰"
-        
-        # System startup and config changes use rabbit emoji
-        if alert_type in ["system_startup", "configuration_change"]:
-            return "🐰"
-        
+
         # All other alerts use rotating light
         return "🚨"
     
@@ -66,118 +141,79 @@ class DiscordAlertSender:
         else:
             title = f"{icon} {alert_name}"
         
+        # Footer content only varies with the system name, so reuse the
+        # cached dict instead of rebuilding it for every embed
+        system = alert_data.get("system", "Transportation")
+        footer = self._footer_cache.get(system)
+        if footer is None:
+            footer = {
+                "text": f"RabbitMQ Queue Watcher • {system}",
+                "icon_url": self.avatar_url
+            }
+            self._footer_cache[system] = footer
+
         # Create embed
         embed = {
             "title": title,
             "description": alert_data.get("description", "GPS system alert"),
             "color": color,
             "fields": [],
-            "footer": {
-                "text": f"RabbitMQ Queue Watcher • {alert_data.get('system', 'Transportation')}",
-                "icon_url": self.avatar_url
-            },
+            "footer": footer,
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        # Add context fields
-        if "queue" in alert_data:
-            embed["fields"].append({
-                "name": "Queue",
-                "value": f"`{alert_data['queue']}`",
-                "inline": True
-            })
-        
-        if "value" in alert_data:
-            embed["fields"].append({
-                "name": "Value", 
-                "value": str(alert_data['value']),
-                "inline": True
-            })
-        
-        # Add severity
-        severity_labels = {
-            "critical": "CRITICAL",
-            "warning": "WARNING", 
-            "info": "INFO"
-        }
-        embed["fields"].append({
+        # Build context fields from the declarative spec, keeping the
+        # Severity field in its usual slot
+        fields = [
+            {"name": label, "value": fmt(alert_data[key]), "inline": inline}
+            for key, label, fmt, inline in _FIELD_SPEC_HEAD if key in alert_data
+        ]
+        fields.append({
             "name": "Severity",
-            "value": severity_labels.get(severity, severity.upper()),
+            "value": _SEVERITY_LABELS.get(severity, severity.upper()),
             "inline": True
         })
-        
-        # Add queue category if available
-        if "queue_category" in alert_data:
-            embed["fields"].append({
-                "name": "Category",
-                "value": alert_data['queue_category'],
-                "inline": True
-            })
-        
-        # Add threshold information if available
-        if "threshold" in alert_data:
-            embed["fields"].append({
-                "name": "Threshold",
-                "value": str(alert_data['threshold']),
-                "inline": True
-            })
-        
-        # Add system health if available
-        if "system_health" in alert_data:
-            embed["fields"].append({
-                "name": "System Health",
-                "value": alert_data['system_health'],
-                "inline": True
-            })
-        
-        # Add target system info if available
-        if "target_system" in alert_data:
-            embed["fields"].append({
-                "name": "Target System",
-                "value": alert_data['target_system'],
-                "inline": True
-            })
-        
-        # Add monitoring mode if available
-        if "monitoring_mode" in alert_data:
-            embed["fields"].append({
-                "name": "Mode",
-                "value": alert_data['monitoring_mode'].title(),
-                "inline": True
-            })
-        
+        fields.extend(
+            {"name": label, "value": fmt(alert_data[key]), "inline": inline}
+            for key, label, fmt, inline in _FIELD_SPEC_TAIL if key in alert_data
+        )
+        embed["fields"] = fields
+
         return embed
     
-    def send_alert(self, alert_data: Dict[str, Any]) -> bool:
-        """Send alert to Discord"""
-        if not self.webhook_url:
-            logger.warning("Discord webhook not configured - skipping alert")
-            return False
-        
+    def _post_embeds(self, embeds) -> bool:
+        """POST a batch of embeds to the webhook"""
         try:
-            embed = self.create_embed(alert_data)
-            
             payload = {
                 "username": self.bot_name,
                 "avatar_url": self.avatar_url,
-                "embeds": [embed]
+                "embeds": embeds
             }
-            
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                timeout=10
-            )
-            
+
+            # orjson emits UTF-8 bytes directly; the session already
+            # carries the JSON content type
+            if orjson is not None:
+                response = self._session.post(
+                    self.webhook_url,
+                    data=orjson.dumps(payload),
+                    timeout=10
+                )
+            else:
+                response = self._session.post(
+                    self.webhook_url,
+                    json=payload,
+                    timeout=10
+                )
+
             if response.status_code == 204:
-                logger.info(f"Discord alert sent: {alert_data.get('alert_name', 'Unknown')}")
+                logger.info(f"Discord alert batch sent: {len(embeds)} embed(s)")
                 return True
             else:
                 logger.error(f"Discord alert failed: HTTP {response.status_code}")
                 if response.text:
                     logger.error(f"Discord error response: {response.text}")
                 return False
-                
+
         except requests.exceptions.Timeout:
             logger.error("Discord alert timeout - webhook unreachable")
             return False
@@ -187,7 +223,65 @@ class DiscordAlertSender:
         except Exception as e:
             logger.error(f"Discord alert error: {e}")
             return False
-    
+
+    def send_alert(self, alert_data: Dict[str, Any]) -> bool:
+        """Send alert to Discord"""
+        if not self.webhook_url:
+            logger.warning("Discord webhook not configured - skipping alert")
+            return False
+
+        return self._post_embeds([self.create_embed(alert_data)])
+
+    def send_alert_nowait(self, alert_data: Dict[str, Any]) -> None:
+        """Send alert without blocking the caller on the webhook round trip"""
+        self._executor.submit(self.send_alert, alert_data)
+
+    def enqueue_alert(self, alert_data: Dict[str, Any]) -> None:
+        """Queue an alert for batched delivery
+
+        Batches flush once 10 embeds accumulate or the 1s window closes,
+        so an alert storm costs one POST per 10 alerts instead of one each.
+        """
+        if not self.webhook_url:
+            logger.warning("Discord webhook not configured - skipping alert")
+            return
+
+        with self._pending_lock:
+            self._pending.append(self.create_embed(alert_data))
+
+            if len(self._pending) > self._max_pending:
+                dropped = len(self._pending) - self._max_pending
+                del self._pending[:dropped]
+                logger.warning(f"Discord alert buffer full - dropped {dropped} oldest alert(s)")
+
+            if len(self._pending) >= self._max_embeds:
+                embeds = self._pending[:self._max_embeds]
+                del self._pending[:self._max_embeds]
+                self._executor.submit(self._post_embeds, embeds)
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self._batch_window, self._flush_pending)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _flush_pending(self):
+        """Flush any queued embeds in webhook-sized batches"""
+        with self._pending_lock:
+            self._flush_timer = None
+            embeds, self._pending = self._pending, []
+
+        for i in range(0, len(embeds), self._max_embeds):
+            self._executor.submit(self._post_embeds, embeds[i:i + self._max_embeds])
+
+    def close(self):
+        """Flush pending sends and release the worker thread"""
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        self._flush_pending()
+        self._executor.shutdown(wait=True)
+        self._session.close()
+
     def test_webhook(self) -> bool:
         """Test Discord webhook with a simple message"""
         if not self.webhook_url:
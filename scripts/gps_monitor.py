@@ -8,13 +8,30 @@ import os
 import json
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 import threading
 import signal
 import sys
+import hashlib
+import types
+import functools
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, Any, Tuple, Set
+from typing import Dict, Any, Optional, Tuple, Set
 from pathlib import Path
+from urllib.parse import quote
 import re
 
 # File watching
@@ -29,65 +46,322 @@ from influx_writer import InfluxDBWriter
 # Setup logging
 logger = logging.getLogger(__name__)
 
+def _json_loads(data: bytes):
+    """Decode JSON bytes with orjson when available, stdlib otherwise"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@dataclass(frozen=True, slots=True)
+class MonitorConfig:
+    """Static monitor settings resolved from the environment once
+
+    Freezing them up front keeps the hot loop free of repeated env
+    lookups and guarantees config reloads can't race the connection
+    settings.
+    """
+    host: str
+    port: int
+    username: str
+    password: str
+    url: str
+    collection_interval: int
+    alert_cooldown: int
+    discord_webhook: Optional[str]
+    monitoring_mode: str
+    read_only_mode: bool
+    target_system_name: str
+
+    @classmethod
+    def from_env(cls) -> "MonitorConfig":
+        host = os.getenv('RABBITMQ_HOST', 'localhost')
+        port = int(os.getenv('RABBITMQ_PORT', 15672))
+        return cls(
+            host=host,
+            port=port,
+            username=os.getenv('RABBITMQ_USERNAME', 'admin'),
+            password=os.getenv('RABBITMQ_PASSWORD', 'password'),
+            url=f"http://{host}:{port}",
+            collection_interval=int(os.getenv('COLLECTION_INTERVAL', 15)),
+            alert_cooldown=int(os.getenv('ALERT_COOLDOWN_MINUTES', 5)) * 60,
+            discord_webhook=os.getenv('DISCORD_WEBHOOK_URL'),
+            monitoring_mode=os.getenv('MONITORING_MODE', 'remote'),
+            read_only_mode=os.getenv('READ_ONLY_MODE', 'true').lower() == 'true',
+            target_system_name=os.getenv('TARGET_SYSTEM_NAME', 'Remote-RabbitMQ')
+        )
+
+
+@dataclass(slots=True)
+class QStat:
+    """Per-queue metrics unpacked once per cycle
+
+    The API payload nests rates three dicts deep; extracting them a
+    single time spares every downstream check the repeated dict walks.
+    """
+    ready: int
+    unacked: int
+    consumers: int
+    publish_rate: float
+    deliver_rate: float
+    # Filled once per cycle by categorize_queue_status so alert checks
+    # reuse the classification instead of recomputing it
+    status: str = ""
+    lag: float = 0.0
+    desc: str = ""
+
+
+# Shared immutable sentinel: missing nested fields fall through to this
+# instead of allocating a throwaway {} default per lookup
+_EMPTY = types.MappingProxyType({})
+
+
+def _to_qstat(queue: Dict) -> QStat:
+    """Flatten a management API queue dict into a QStat"""
+    message_stats = queue.get('message_stats') or _EMPTY
+    return QStat(
+        ready=queue.get('messages_ready', 0),
+        unacked=queue.get('messages_unacknowledged', 0),
+        consumers=queue.get('consumers', 0),
+        publish_rate=(message_stats.get('publish_details') or _EMPTY).get('rate', 0),
+        deliver_rate=(message_stats.get('deliver_get_details') or _EMPTY).get('rate', 0)
+    )
+
+
+# Schema mirror of validate_configuration's manual checks; compiled once
+# so reloads validate without re-walking the config in Python
+QUEUE_SCHEMA = {
+    "type": "object",
+    "required": ["queue_monitoring"],
+    "properties": {
+        "queue_monitoring": {
+            "type": "object",
+            "required": ["queues"],
+            "properties": {
+                "queues": {
+                    "type": "object",
+                    "additionalProperties": {
+                        "type": "object",
+                        "required": ["category", "thresholds"],
+                        "properties": {
+                            "category": {"enum": ["CORE", "SUPPORT"]},
+                            "thresholds": {
+                                "type": "object",
+                                "required": [
+                                    "high_backlog",
+                                    "critical_lag_seconds",
+                                    "no_consumers_alert"
+                                ]
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+# Discovery/categorization patterns compiled once as a single
+# alternation: one regex pass per name instead of one match per pattern
+_DISCOVERY_PATTERN = re.compile("|".join(f"(?:{p})" for p in (
+    r'^gps_queue.*',
+    r'^.*_position_queue$',
+    r'^bus_tracking.*',
+    r'^pis_queue.*'
+)), re.IGNORECASE)
+
+# CORE queue patterns (critical for operations)
+_CORE_PATTERN = re.compile("|".join(f"(?:{p})" for p in (
+    r'^gps_queue(?!_history).*',      # GPS queues except history
+    r'^current_position_queue.*',      # Real-time positioning
+    r'^bus_tracking_queue.*',          # Bus tracking
+    r'^pis_queue.*',                   # Passenger information
+)), re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1024)
+def _categorize_name(queue_name: str) -> str:
+    """Pattern-based CORE/SUPPORT categorization, memoized per name
+
+    Queue names recur across discovery sweeps and notifications, so the
+    regex runs once per distinct name for the life of the process.
+    """
+    return "CORE" if _CORE_PATTERN.match(queue_name) else "SUPPORT"
+
+
+_LOG_RULE = "=" * 90
+
+
+# Fallback per-queue config tuple: (high_backlog, critical_lag_seconds,
+# no_consumers_alert, is_core)
+_DEFAULT_QCFG = (1000, 0, False, False)
+
+
+# Alert description templates, formatted only after the cooldown gate
+# passes so the cold path allocates nothing
+_BACKLOG_DESC_TMPL = (
+    "CRITICAL BACKLOG{trend}\n\n"
+    "{category} queue **{queue}** has **{ready:,}** messages pending!\n\n"
+    "Threshold: {threshold:,} messages\nStatus: {status}"
+)
+
+_NO_CONSUMERS_DESC_TMPL = (
+    "NO CONSUMERS\n\n"
+    "{category} queue **{queue}** has **{ready}** messages but **NO CONSUMERS**!\n\n"
+    "Processing completely stopped."
+)
+
+_STALLED_DESC_TMPL = (
+    "QUEUE STALLED\n\n"
+    "Queue **{queue}** has **NO MESSAGES** and **NO CONSUMERS**!\n\n"
+    "No activity detected - system may be down."
+)
+
+_ALERT_NAMES = {
+    "queue_backlog": "{} Queue Backlog",
+    "no_consumers": "{} No Consumers",
+    "stalled_queue": "{} Queue Stalled",
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _alert_skeleton(category_name: str, alert_type: str, severity: str) -> Dict[str, Any]:
+    """Constant portion of an alert payload, cached per (category, type)
+
+    Repeated firings of the same alert shape reuse one skeleton dict
+    instead of rebuilding the invariant keys each time; callers unpack
+    it and add the per-firing fields.
+    """
+    return {
+        "alert_name": _ALERT_NAMES[alert_type].format(category_name),
+        "severity": severity,
+        "alert_type": alert_type,
+        "status": "firing",
+        "queue_category": category_name,
+        "system": "RMQ-Queue"
+    }
+
+
+# Only the fields the monitor actually reads; asking the management API
+# to project them server-side shrinks the payload and the JSON decode
+_QUEUE_COLUMNS = ",".join([
+    "name",
+    "messages_ready",
+    "messages_unacknowledged",
+    "consumers",
+    "message_stats.publish_details.rate",
+    "message_stats.deliver_get_details.rate"
+])
+
 
 class QueueConfigHandler(FileSystemEventHandler):
     """File system event handler for configuration changes"""
-    
+
+    # Reload only after the filesystem has been quiet this long, so an
+    # editor's burst of write events triggers a single reload
+    DEBOUNCE_SECONDS = 0.5
+
     def __init__(self, monitor_instance):
         self.monitor = monitor_instance
-        
+        # Only the monitored file matters; everything else in the
+        # watched directory (logs, tempfiles) is rejected on basename
+        self._config_basename = os.path.basename(monitor_instance.config_file)
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def _schedule_reload(self, path):
+        logger.info(f"Configuration file changed: {path}")
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.DEBOUNCE_SECONDS, self.monitor.reload_configuration)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self):
+        """Drop any pending debounced reload (called from cleanup)"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _handle(self, event, path):
+        if os.path.basename(path) == self._config_basename:
+            self._schedule_reload(path)
+
     def on_modified(self, event):
-        if event.src_path.endswith('.json') and 'queue' in event.src_path.lower():
-            logger.info(f"Configuration file changed: {event.src_path}")
-            time.sleep(0.5)  # Brief delay to ensure file write is complete
-            self.monitor.reload_configuration()
+        self._handle(event, event.src_path)
+
+    def on_created(self, event):
+        self._handle(event, event.src_path)
+
+    def on_moved(self, event):
+        # Editors often write a tempfile and os.replace it into place
+        self._handle(event, event.dest_path)
 
 
 class AlertRecoveryTracker:
-    """Track alert states and detect recoveries"""
-    
+    """Track alert states and detect recoveries
+
+    Reads vastly outnumber writes (one check per queue per cycle vs the
+    occasional fired alert), so the per-queue read path is lock-free:
+    dict reference loads are atomic under the GIL. The lock only guards
+    structural writes, which swap in a fresh dict copy-on-write so
+    readers never observe a half-built mapping.
+    """
+
     def __init__(self):
         self.active_alerts = {}
         self.lock = threading.Lock()
-    
+
     def track_alert(self, queue_name: str, alert_type: str):
         """Track when alert is sent"""
+        entry = {
+            'type': alert_type,
+            'timestamp': time.monotonic(),
+            'resolved': False
+        }
+        with self.lock:
+            self.active_alerts = {**self.active_alerts, queue_name: entry}
+
+    def prune(self, max_age: float, valid_queues=None):
+        """Evict resolved or stale entries so the dict stays bounded"""
+        now = time.monotonic()
         with self.lock:
-            self.active_alerts[queue_name] = {
-                'type': alert_type,
-                'timestamp': time.time(),
-                'resolved': False
+            self.active_alerts = {
+                name: info for name, info in self.active_alerts.items()
+                if not (info['resolved'] and now - info['timestamp'] > max_age)
+                and (valid_queues is None or name in valid_queues)
             }
-    
-    def check_recovery(self, queue_name: str, queue_data: Dict, monitor) -> bool:
+
+    def check_recovery(self, queue_name: str, stat: "QStat", monitor) -> bool:
         """Check if queue has recovered from previous alerts"""
-        with self.lock:
-            if queue_name not in self.active_alerts:
-                return False
-            
-            alert_info = self.active_alerts[queue_name]
-            if alert_info['resolved']:
-                return False
-            
-            # Check recovery conditions
-            messages_ready = queue_data.get('messages_ready', 0)
-            consumers = queue_data.get('consumers', 0)
-            threshold = monitor.get_queue_threshold(queue_name, 'high_backlog', 1000)
-            
-            is_recovered = (
-                messages_ready < (threshold * 0.3) and  # Below 30% of alert threshold
-                consumers > 0 and                       # Has active consumers
-                messages_ready < 50                     # Reasonable queue size
-            )
-            
-            if is_recovered:
-                recovery_time = time.time() - alert_info['timestamp']
-                monitor.send_recovery_alert(queue_name, recovery_time, alert_info['type'])
-                alert_info['resolved'] = True
-                return True
-            
+        # Lock-free fast path: snapshot the entry; no cycle pays an
+        # acquire/release just to learn there's nothing to recover
+        alert_info = self.active_alerts.get(queue_name)
+        if alert_info is None or alert_info['resolved']:
             return False
 
+        # Check recovery conditions
+        threshold = monitor._qcfg.get(queue_name, _DEFAULT_QCFG)[0]
+
+        is_recovered = (
+            stat.ready < (threshold * 0.3) and  # Below 30% of alert threshold
+            stat.consumers > 0 and              # Has active consumers
+            stat.ready < 50                     # Reasonable queue size
+        )
+
+        if not is_recovered:
+            return False
+
+        # Single-key flag flip is atomic; worst case a racing
+        # track_alert replaces the entry and the queue re-alerts
+        alert_info['resolved'] = True
+        recovery_time = time.monotonic() - alert_info['timestamp']
+
+        monitor.send_recovery_alert(queue_name, recovery_time, alert_info['type'])
+        return True
+
 
 class ProductionGPSMonitor:
     """Production Queue Monitor with InfluxDB storage and Discord alerting"""
@@ -95,37 +369,69 @@ class ProductionGPSMonitor:
     def __init__(self):
         # Configuration
         self.config_file = os.getenv('QUEUE_CONFIG_FILE', 'config/queues.json')
+        self._config_dir = Path(self.config_file).resolve().parent
         self.config = {}
-        self.target_queues = []
+        self.target_queues = ()
+        self._target_queue_set = frozenset()
+        self._cfg_digest = None
+        self._cfg_mtime = None
+
+        # Compile the config schema once; reloads reuse the validator
+        self._validator = (
+            jsonschema.Draft202012Validator(QUEUE_SCHEMA) if jsonschema else None
+        )
         self.core_queues = []
         self.support_queues = []
         self.queue_thresholds = {}
         
-        # RabbitMQ connection settings
-        self.rabbitmq_host = os.getenv('RABBITMQ_HOST', 'localhost')
-        self.rabbitmq_port = int(os.getenv('RABBITMQ_PORT', 15672))
-        self.rabbitmq_user = os.getenv('RABBITMQ_USERNAME', 'admin')
-        self.rabbitmq_pass = os.getenv('RABBITMQ_PASSWORD', 'password')
-        self.rabbitmq_url = f"http://{self.rabbitmq_host}:{self.rabbitmq_port}"
+        # Static settings resolved once; the familiar attribute names
+        # below stay as views onto the frozen config
+        self.cfg = MonitorConfig.from_env()
+        self.rabbitmq_host = self.cfg.host
+        self.rabbitmq_port = self.cfg.port
+        self.rabbitmq_user = self.cfg.username
+        self.rabbitmq_pass = self.cfg.password
+        self.rabbitmq_url = self.cfg.url
         self.auth = (self.rabbitmq_user, self.rabbitmq_pass)
-        
+
+        # Pooled session keeps the management API connection warm so each
+        # polling cycle reuses one socket instead of a fresh handshake
+        self.http = requests.Session()
+        self.http.auth = self.auth
+        self.http.headers.update({
+            "Accept": "application/json",
+            "Connection": "keep-alive"
+        })
+        self.http.mount("http://", HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=4,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        ))
+
         # Monitoring settings
-        self.collection_interval = int(os.getenv('COLLECTION_INTERVAL', 15))
-        self.alert_cooldown = int(os.getenv('ALERT_COOLDOWN_MINUTES', 5)) * 60
-        
+        self.collection_interval = self.cfg.collection_interval
+        self.alert_cooldown = self.cfg.alert_cooldown
+
         # Alert management (Discord only)
-        self.discord_webhook = os.getenv('DISCORD_WEBHOOK_URL')
+        self.discord_webhook = self.cfg.discord_webhook
         if not self.discord_webhook:
             raise ValueError("DISCORD_WEBHOOK_URL is required")
         
         self.discord_sender = DiscordAlertSender(self.discord_webhook)
+        self._pending_alerts = []
         self.last_alert_time = {}
+        # Monotonic timestamp of the last successful management API call;
+        # the health server's /ready handler reads it to avoid probing
+        # RabbitMQ itself
+        self.last_rabbitmq_ok = 0.0
+        # Per-queue alert key tuples, built lazily by check_queue_alerts
+        self._alert_keys = {}
         self.recovery_tracker = AlertRecoveryTracker()
         
         # Production settings
-        self.monitoring_mode = os.getenv('MONITORING_MODE', 'remote')
-        self.read_only_mode = os.getenv('READ_ONLY_MODE', 'true').lower() == 'true'
-        self.target_system_name = os.getenv('TARGET_SYSTEM_NAME', 'Remote-RabbitMQ')
+        self.monitoring_mode = self.cfg.monitoring_mode
+        self.read_only_mode = self.cfg.read_only_mode
+        self.target_system_name = self.cfg.target_system_name
         self.shutdown_notification_sent = False
         
         # Queue discovery
@@ -152,22 +458,46 @@ class ProductionGPSMonitor:
         logger.info(f"InfluxDB: {'Enabled' if self.influx_writer else 'Disabled'}")
         logger.info("Alert system: Discord only")
     
-    def load_configuration(self):
-        """Load queue configuration from JSON file"""
+    def load_configuration(self) -> bool:
+        """Load queue configuration from JSON file
+
+        Returns True when the configuration was actually (re)parsed,
+        False when the file content was byte-identical to the last load.
+        """
         if not os.path.exists(self.config_file):
             raise FileNotFoundError(f"Configuration file not found: {self.config_file}")
-        
+
         try:
-            with open(self.config_file, 'r') as f:
-                self.config = json.load(f)
-            
+            # Fast path: an untouched mtime means the file wasn't even
+            # rewritten, so skip the read and hash outright
+            mtime = os.stat(self.config_file).st_mtime_ns
+            if self._cfg_mtime is not None and mtime == self._cfg_mtime:
+                logger.debug("Configuration unchanged - skipping reload")
+                return False
+
+            data = Path(self.config_file).read_bytes()
+
+            # touch/ConfigMap syncs rewrite the file without changing the
+            # bytes; a matching digest alone is enough to skip the
+            # re-parse, re-validate, and diff
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            if digest == self._cfg_digest:
+                self._cfg_mtime = mtime
+                logger.debug("Configuration unchanged - skipping reload")
+                return False
+            self._cfg_digest = digest
+            self._cfg_mtime = mtime
+
+            self.config = _json_loads(data)
+
             self.parse_queue_configuration()
             self.validate_configuration()
-            
-            logger.info(f"Configuration loaded: {len(self.target_queues)} queues")
-            logger.info(f"CORE queues: {self.core_queues}")
-            logger.info(f"SUPPORT queues: {self.support_queues}")
-            
+
+            logger.info("Configuration loaded: %d queues", len(self.target_queues))
+            logger.info("CORE queues: %s", self.core_queues)
+            logger.info("SUPPORT queues: %s", self.support_queues)
+            return True
+
         except Exception as e:
             logger.error(f"Error loading configuration: {e}")
             raise
@@ -175,8 +505,10 @@ class ProductionGPSMonitor:
     def parse_queue_configuration(self):
         """Parse loaded configuration into working variables"""
         queues_config = self.config.get('queue_monitoring', {}).get('queues', {})
-        
-        self.target_queues = list(queues_config.keys())
+
+        # Tuple: iteration order is fixed at parse time and the hot loop
+        # never mutates it
+        self.target_queues = tuple(queues_config.keys())
         self.core_queues = []
         self.support_queues = []
         self.queue_thresholds = {}
@@ -191,11 +523,48 @@ class ProductionGPSMonitor:
             
             # Store thresholds per queue
             self.queue_thresholds[queue_name] = queue_config.get('thresholds', {})
-    
+
+        # Frozen set for O(1) membership tests in the per-cycle filter
+        self._target_queue_set = frozenset(self.target_queues)
+        self._rebuild_name_filter()
+
+        # Name -> category label, built once so the per-cycle loops do a
+        # single dict lookup instead of a list scan
+        self._queue_category = {
+            name: 'CORE' if name in self.core_queues else 'SUPPORT'
+            for name in self.target_queues
+        }
+
+        # Flat config tuples: one dict hit per queue per cycle instead of
+        # chained .get chains for each threshold
+        self._qcfg = {
+            name: (
+                th.get('high_backlog', 1000),
+                th.get('critical_lag_seconds', 0),
+                bool(th.get('no_consumers_alert', False)),
+                self._queue_category[name] == 'CORE'
+            )
+            for name, th in self.queue_thresholds.items()
+        }
+
+        # Cached CORE count: the health check runs every cycle, the list
+        # only changes on reload/discovery
+        self._total_core = len(self.core_queues)
+
     def validate_configuration(self):
         """Basic validation of configuration"""
+        if self._validator is not None:
+            errors = [
+                f"{'/'.join(str(p) for p in e.path) or 'config'}: {e.message}"
+                for e in self._validator.iter_errors(self.config)
+            ]
+            if errors:
+                raise ValueError(f"Configuration validation failed: {'; '.join(errors)}")
+            return
+
+        # Fallback: manual walk when jsonschema is not installed
         errors = []
-        
+
         # Check required structure
         if 'queue_monitoring' not in self.config:
             errors.append("Missing 'queue_monitoring' section")
@@ -229,14 +598,12 @@ class ProductionGPSMonitor:
     def setup_file_watcher(self):
         """Setup file system watcher for configuration changes"""
         try:
-            config_dir = os.path.dirname(os.path.abspath(self.config_file))
-            
             self.config_handler = QueueConfigHandler(self)
             self.observer = Observer()
-            self.observer.schedule(self.config_handler, config_dir, recursive=False)
+            self.observer.schedule(self.config_handler, str(self._config_dir), recursive=False)
             self.observer.start()
-            
-            logger.info(f"File watcher started for: {config_dir}")
+
+            logger.info(f"File watcher started for: {self._config_dir}")
             
         except Exception as e:
             logger.warning(f"File watcher setup failed: {e}")
@@ -250,30 +617,48 @@ class ProductionGPSMonitor:
             logger.error(f"Failed to start health server: {e}")
             raise RuntimeError(f"Cannot start health server: {e}")
     
+    def _rebuild_name_filter(self):
+        """Precompute the mgmt API name= filter for the target queues
+
+        With discovery off the broker can filter rows server-side, so
+        the per-cycle payload scales with the monitored set rather than
+        with every queue on the vhost.
+        """
+        if self.target_queues:
+            pattern = f"^({'|'.join(re.escape(name) for name in self.target_queues)})$"
+            self._name_filter = f"&use_regex=true&name={quote(pattern)}"
+        else:
+            self._name_filter = ""
+
     def get_queue_threshold(self, queue_name: str, threshold_type: str, default_value: int) -> int:
         """Get specific threshold for a queue"""
         return self.queue_thresholds.get(queue_name, {}).get(threshold_type, default_value)
     
     def is_core_queue(self, queue_name: str) -> bool:
         """Check if queue is CORE priority"""
-        return queue_name in self.core_queues
+        return self._queue_category.get(queue_name) == 'CORE'
     
     def should_alert_no_consumers(self, queue_name: str) -> bool:
         """Check if should alert when no consumers"""
-        return self.queue_thresholds.get(queue_name, {}).get('no_consumers_alert', False)
+        return self._qcfg.get(queue_name, _DEFAULT_QCFG)[2]
     
-    def discover_and_monitor_queues(self) -> Set[str]:
-        """Auto-discover and register new queues"""
+    def discover_and_monitor_queues(self, server_names=None) -> Set[str]:
+        """Auto-discover and register new queues
+
+        When the caller already holds this cycle's queue listing it
+        passes the names in, so discovery doesn't re-poll the API.
+        """
         if not self.queue_discovery_enabled:
-            return set(self.target_queues)
-        
+            return self._target_queue_set
+
         try:
-            # Get all queues from config
-            config_queues = set(self.target_queues)
-            
             # Get all matching queues from server
-            server_queues = self.get_matching_server_queues()
-            
+            server_queues = self.get_matching_server_queues(server_names)
+
+            # Steady state: nothing changed, skip the diff entirely
+            if server_queues == self.discovered_queues:
+                return self.discovered_queues
+
             # Find new queues
             new_queues = server_queues - self.discovered_queues
             
@@ -289,38 +674,28 @@ class ProductionGPSMonitor:
             
         except Exception as e:
             logger.error(f"Error during queue discovery: {e}")
-            return set(self.target_queues)  # Fallback to config queues
+            return self._target_queue_set  # Fallback to config queues
     
-    def get_matching_server_queues(self) -> Set[str]:
+    def get_matching_server_queues(self, all_queues=None) -> Set[str]:
         """Get queues that match pattern or config"""
         try:
-            response = requests.get(f"{self.rabbitmq_url}/api/queues", auth=self.auth, timeout=10)
-            response.raise_for_status()
-            all_queues = [q['name'] for q in response.json()]
+            if all_queues is None:
+                response = self.http.get(f"{self.rabbitmq_url}/api/queues", timeout=(2, 10))
+                response.raise_for_status()
+                all_queues = [q['name'] for q in _json_loads(response.content)]
             
             # Method 1: From config file
-            config_queues = set(self.target_queues)
-            
+            config_queues = self._target_queue_set
+
             # Method 2: Pattern matching for auto-discovery
-            patterns = [
-                r'^gps_queue.*',
-                r'^.*_position_queue$',
-                r'^bus_tracking.*',
-                r'^pis_queue.*'
-            ]
-            
-            pattern_matches = set()
-            for queue in all_queues:
-                for pattern in patterns:
-                    if re.match(pattern, queue, re.IGNORECASE):
-                        pattern_matches.add(queue)
-            
+            pattern_matches = {q for q in all_queues if _DISCOVERY_PATTERN.match(q)}
+
             # Union of config + patterns
             return config_queues.union(pattern_matches)
             
         except Exception as e:
             logger.error(f"Error getting server queues: {e}")
-            return set(self.target_queues)  # Fallback to config
+            return self._target_queue_set  # Fallback to config
     
     def register_new_queues(self, new_queues: Set[str]):
         """Register newly discovered queues"""
@@ -334,8 +709,8 @@ class ProductionGPSMonitor:
                 self.support_queues.append(queue_name)
             
             # Add to target queues
-            if queue_name not in self.target_queues:
-                self.target_queues.append(queue_name)
+            if queue_name not in self._target_queue_set:
+                self.target_queues += (queue_name,)
             
             # Set default thresholds
             self.queue_thresholds[queue_name] = {
@@ -343,25 +718,19 @@ class ProductionGPSMonitor:
                 'critical_lag_seconds': 60,
                 'no_consumers_alert': category == 'CORE'
             }
-            
+            self._qcfg[queue_name] = (1000, 60, category == 'CORE', category == 'CORE')
+
+            self._queue_category[queue_name] = category
             logger.info(f"Registered new {category} queue: {queue_name}")
-    
+
+        self._target_queue_set = frozenset(self.target_queues)
+        self._rebuild_name_filter()
+        self._total_core = len(self.core_queues)
+
     def categorize_queue_by_pattern(self, queue_name: str) -> str:
         """Categorize queue based on naming patterns"""
-        # CORE queue patterns (critical for operations)
-        core_patterns = [
-            r'^gps_queue(?!_history).*',      # GPS queues except history
-            r'^current_position_queue.*',      # Real-time positioning
-            r'^bus_tracking_queue.*',          # Bus tracking
-            r'^pis_queue.*',                   # Passenger information
-        ]
-        
-        for pattern in core_patterns:
-            if re.match(pattern, queue_name, re.IGNORECASE):
-                return "CORE"
-        
-        # Everything else is SUPPORT
-        return "SUPPORT"
+        # Everything that doesn't match a CORE pattern is SUPPORT
+        return _categorize_name(queue_name)
     
     def send_discovery_notification(self, new_queues: Set[str]):
         """Send notification about newly discovered queues"""
@@ -378,23 +747,38 @@ class ProductionGPSMonitor:
             "value": f"{len(new_queues)} queues",
             "system": "RMQ-Queue"
         }
-        self.send_discord_alert(alert_data)
+        # Not urgent: ride the sender's batching path so discovery bursts
+        # share a webhook POST with the cycle's alerts
+        self.discord_sender.enqueue_alert(alert_data)
     
     def get_queue_details(self) -> Dict[str, Dict]:
         """Get queue details from RabbitMQ Management API"""
         try:
-            response = requests.get(
-                f"{self.rabbitmq_url}/api/queues",
-                auth=self.auth,
-                timeout=10
-            )
+            # Per-vhost path plus columns= projection: the broker filters
+            # and trims the response instead of shipping every queue's
+            # full stats blob over the wire. With discovery off, the
+            # name= regex also drops unmonitored rows server-side;
+            # discovery needs the full listing to spot new queues.
+            url = f"{self.rabbitmq_url}/api/queues/%2F?columns={_QUEUE_COLUMNS}"
+            if not self.queue_discovery_enabled:
+                url += self._name_filter
+            response = self.http.get(url, timeout=(2, 10))
             response.raise_for_status()
-            
-            # Get current monitored queues (including discovered ones)
-            current_queues = self.discover_and_monitor_queues()
-            
+
+            # Readiness probes reuse this as proof of broker connectivity
+            self.last_rabbitmq_ok = time.monotonic()
+
+            # Decode straight from the response bytes, skipping the
+            # intermediate str pass
+            all_queues = _json_loads(response.content)
+
+            # Feed discovery the names we already have so a discovery
+            # cycle doesn't issue a second /api/queues round trip
+            current_queues = self.discover_and_monitor_queues(
+                [q.get('name', '') for q in all_queues]
+            )
+
             # Filter only monitored queues
-            all_queues = response.json()
             monitored_queue_data = {}
             
             for queue in all_queues:
@@ -408,47 +792,58 @@ class ProductionGPSMonitor:
             logger.error(f"Error fetching queue details: {e}")
             return {}
     
-    def categorize_queue_status(self, queue_data: Dict) -> Tuple[str, float, str]:
+    def categorize_queue_status(self, stat: QStat) -> Tuple[str, float, str]:
         """Categorize queue processing status"""
-        messages_ready = queue_data.get('messages_ready', 0)
-        message_stats = queue_data.get('message_stats', {})
-        
-        publish_rate = message_stats.get('publish_details', {}).get('rate', 0)
-        deliver_rate = message_stats.get('deliver_get_details', {}).get('rate', 0)
-        net_rate = deliver_rate - publish_rate
-        
-        if net_rate > 0.1:  # Queue draining
-            lag = messages_ready / net_rate if net_rate > 0 else 0
+        messages_ready = stat.ready
+        deliver_rate = stat.deliver_rate
+
+        # Idle fast path: most queues sit empty with no traffic, so skip
+        # the rate arithmetic entirely for them
+        if messages_ready == 0 and deliver_rate == 0 and stat.publish_rate == 0:
+            return "STALLED", 999, "No processing activity"
+
+        net_rate = deliver_rate - stat.publish_rate
+
+        # Sign-based classification: one comparison pair decides the
+        # branch, no abs() on the hot path
+        direction = (net_rate > 0.1) - (net_rate < -0.1)
+
+        if direction > 0:  # Queue draining
+            lag = messages_ready / net_rate
             return "DRAINING", lag, f"Queue clearing in {lag:.1f}s"
-        
-        elif abs(net_rate) <= 0.1:  # Stable
-            if deliver_rate > 0:
-                stable_lag = messages_ready / deliver_rate if deliver_rate > 0 else 0
-                return "STABLE", stable_lag, f"Stable {stable_lag:.1f}s lag"
-            else:
-                return "STALLED", 999, "No processing activity"
-        
-        else:  # Growing queue
-            growth_rate = abs(net_rate)
-            return "GROWING", 9999, f"Growing at {growth_rate:.1f} msg/sec"
+
+        if direction < 0:  # Growing queue
+            return "GROWING", 9999, f"Growing at {-net_rate:.1f} msg/sec"
+
+        # Stable band
+        if deliver_rate > 0:
+            stable_lag = messages_ready / deliver_rate
+            return "STABLE", stable_lag, f"Stable {stable_lag:.1f}s lag"
+        return "STALLED", 999, "No processing activity"
     
-    def get_queue_status_icon(self, queue_data: Dict, queue_name: str) -> str:
+    def get_queue_status_icon(self, stat: QStat, queue_name: str) -> str:
         """Get simple status icon based on queue condition"""
-        messages_ready = queue_data.get('messages_ready', 0)
-        consumers = queue_data.get('consumers', 0)
-        high_backlog_threshold = self.get_queue_threshold(queue_name, 'high_backlog', 1000)
-        
+        high_backlog_threshold = self._qcfg.get(queue_name, _DEFAULT_QCFG)[0]
+
         # Simple, clear status based on real conditions
-        if consumers == 0 and messages_ready > 0:
+        if stat.consumers == 0 and stat.ready > 0:
             return "CRITICAL"    # No processing
-        elif messages_ready > high_backlog_threshold:
+        elif stat.ready > high_backlog_threshold:
             return "WARNING"     # High backlog
         else:
             return "HEALTHY"     # Normal operation
     
     def should_send_alert(self, alert_key: str) -> bool:
         """Check if enough time has passed for alert cooldown"""
-        now = time.time()
+        now = time.monotonic()
+
+        # Evict entries past twice the cooldown so queues that come and
+        # go across config reloads don't leak state in a long-running
+        # daemon; anything evicted would have passed the check anyway
+        stale_cutoff = 2 * self.alert_cooldown
+        for key in [k for k, t in self.last_alert_time.items() if now - t > stale_cutoff]:
+            del self.last_alert_time[key]
+
         if alert_key not in self.last_alert_time:
             self.last_alert_time[alert_key] = now
             return True
@@ -466,6 +861,27 @@ class ProductionGPSMonitor:
         except Exception as e:
             logger.error(f"Discord alert failed: {e}")
             return False
+
+    def queue_discord_alert(self, alert_data: Dict[str, Any]):
+        """Collect an alert for the per-cycle batched flush"""
+        self._pending_alerts.append(alert_data)
+
+    def flush_discord_alerts(self):
+        """Hand the cycle's alerts to the sender's batching path
+
+        During a brown-out every queue can fire on the same cycle; the
+        sender bundles up to 10 embeds per webhook POST, so the burst
+        costs one round trip per 10 alerts instead of one each.
+        """
+        if not self._pending_alerts:
+            return
+
+        alerts, self._pending_alerts = self._pending_alerts, []
+        for alert_data in alerts:
+            try:
+                self.discord_sender.enqueue_alert(alert_data)
+            except Exception as e:
+                logger.error(f"Discord alert failed: {e}")
     
     def send_recovery_alert(self, queue_name: str, recovery_time: float, original_alert_type: str):
         """Send recovery alert for a queue"""
@@ -481,31 +897,52 @@ class ProductionGPSMonitor:
             "original_alert": original_alert_type,
             "system": "RMQ-Queue"
         }
-        self.send_discord_alert(alert_data)
+        self.queue_discord_alert(alert_data)
     
-    def check_queue_alerts(self, queue_name: str, queue_data: Dict):
+    def check_queue_alerts(self, queue_name: str, stat: QStat):
         """Check for alert conditions and send notifications"""
-        messages_ready = queue_data.get('messages_ready', 0)
-        consumers = queue_data.get('consumers', 0)
-        
-        # Get queue-specific thresholds
-        high_backlog_threshold = self.get_queue_threshold(queue_name, 'high_backlog', 1000)
-        should_alert_consumers = self.should_alert_no_consumers(queue_name)
-        
-        # Determine severity based on category
-        is_core = self.is_core_queue(queue_name)
+        # Check for recovery first
+        self.recovery_tracker.check_recovery(queue_name, stat, self)
+
+        # Alert keys built once per queue, not per cycle
+        keys = self._alert_keys.get(queue_name)
+        if keys is None:
+            keys = self._alert_keys[queue_name] = (
+                f"backlog_{queue_name}",
+                f"no_consumers_{queue_name}",
+                f"stalled_{queue_name}"
+            )
+        backlog_key, no_consumers_key, stalled_key = keys
+
+        # Cooldown prefilter: when every key for this queue is still
+        # cooling down nothing below can fire, so skip the branch work
+        last = self.last_alert_time
+        now = time.monotonic()
+        cooldown = self.alert_cooldown
+        if all(
+            t is not None and now - t <= cooldown
+            for t in (last.get(backlog_key), last.get(no_consumers_key),
+                      last.get(stalled_key))
+        ):
+            return
+
+        messages_ready = stat.ready
+        consumers = stat.consumers
+
+        # One flat lookup covers thresholds, alert flags, and category
+        high_backlog_threshold, _, should_alert_consumers, is_core = \
+            self._qcfg.get(queue_name, _DEFAULT_QCFG)
+
         base_severity = "critical" if is_core else "warning"
         category_name = "CORE" if is_core else "SUPPORT"
-        
-        # Check for recovery first
-        self.recovery_tracker.check_recovery(queue_name, queue_data, self)
-        
+
         # High backlog alert
         if messages_ready > high_backlog_threshold:
-            alert_key = f"backlog_{queue_name}"
+            alert_key = backlog_key
             if self.should_send_alert(alert_key):
-                status, lag, description = self.categorize_queue_status(queue_data)
-                
+                # Classification already done in collect_metrics
+                status, description = stat.status, stat.desc
+
                 trend_description = ""
                 if status == "GROWING":
                     trend_description = " (GROWING - getting worse!)"
@@ -515,54 +952,50 @@ class ProductionGPSMonitor:
                     trend_description = " (draining - improving)"
                 
                 alert_data = {
-                    "alert_name": f"{category_name} Queue Backlog",
-                    "description": f"CRITICAL BACKLOG{trend_description}\n\n{category_name} queue **{queue_name}** has **{messages_ready:,}** messages pending!\n\nThreshold: {high_backlog_threshold:,} messages\nStatus: {description}",
-                    "severity": base_severity,
-                    "alert_type": "queue_backlog",
-                    "status": "firing",
+                    **_alert_skeleton(category_name, "queue_backlog", base_severity),
+                    "description": _BACKLOG_DESC_TMPL.format(
+                        trend=trend_description,
+                        category=category_name,
+                        queue=queue_name,
+                        ready=messages_ready,
+                        threshold=high_backlog_threshold,
+                        status=description
+                    ),
                     "queue": queue_name,
                     "value": f"{messages_ready:,} messages",
-                    "queue_category": category_name,
-                    "threshold": high_backlog_threshold,
-                    "system": "RMQ-Queue"
+                    "threshold": high_backlog_threshold
                 }
-                self.send_discord_alert(alert_data)
+                self.queue_discord_alert(alert_data)
                 self.recovery_tracker.track_alert(queue_name, "queue_backlog")
         
         # No consumers alert
         if should_alert_consumers and consumers == 0 and messages_ready > 0:
-            alert_key = f"no_consumers_{queue_name}"
+            alert_key = no_consumers_key
             if self.should_send_alert(alert_key):
                 alert_data = {
-                    "alert_name": f"{category_name} No Consumers",
-                    "description": f"NO CONSUMERS\n\n{category_name} queue **{queue_name}** has **{messages_ready}** messages but **NO CONSUMERS**!\n\nProcessing completely stopped.",
-                    "severity": "critical",
-                    "alert_type": "no_consumers", 
-                    "status": "firing",
+                    **_alert_skeleton(category_name, "no_consumers", "critical"),
+                    "description": _NO_CONSUMERS_DESC_TMPL.format(
+                        category=category_name,
+                        queue=queue_name,
+                        ready=messages_ready
+                    ),
                     "queue": queue_name,
-                    "value": f"0 consumers, {messages_ready} messages",
-                    "queue_category": category_name,
-                    "system": "RMQ-Queue"
+                    "value": f"0 consumers, {messages_ready} messages"
                 }
-                self.send_discord_alert(alert_data)
+                self.queue_discord_alert(alert_data)
                 self.recovery_tracker.track_alert(queue_name, "no_consumers")
         
         # Stalled queue alert (no messages and no consumers)
         if messages_ready == 0 and consumers == 0:
-            alert_key = f"stalled_{queue_name}"
+            alert_key = stalled_key
             if self.should_send_alert(alert_key):
                 alert_data = {
-                    "alert_name": f"{category_name} Queue Stalled",
-                    "description": f"QUEUE STALLED\n\nQueue **{queue_name}** has **NO MESSAGES** and **NO CONSUMERS**!\n\nNo activity detected - system may be down.",
-                    "severity": "critical",
-                    "alert_type": "stalled_queue",
-                    "status": "firing", 
+                    **_alert_skeleton(category_name, "stalled_queue", "critical"),
+                    "description": _STALLED_DESC_TMPL.format(queue=queue_name),
                     "queue": queue_name,
-                    "value": "0 messages, 0 consumers",
-                    "queue_category": category_name,
-                    "system": "RMQ-Queue"
+                    "value": "0 messages, 0 consumers"
                 }
-                self.send_discord_alert(alert_data)
+                self.queue_discord_alert(alert_data)
                 self.recovery_tracker.track_alert(queue_name, "stalled_queue")
     
     def collect_metrics(self):
@@ -575,47 +1008,47 @@ class ProductionGPSMonitor:
         
         total_backlog = 0
         core_healthy = 0
-        total_core = len(self.core_queues)
+        total_core = self._total_core
         
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        logger.info(f"Queue Status - {timestamp}")
-        logger.info("=" * 90)
+        # Skip the whole per-queue console block when INFO is filtered;
+        # one level check instead of N suppressed log calls
+        log_info = logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info("Queue Status - %s", time.strftime('%Y-%m-%d %H:%M:%S'))
+            logger.info(_LOG_RULE)
         
         for queue_name, queue in queue_data.items():
-            category = "CORE" if self.is_core_queue(queue_name) else "SUPPORT"
-            
-            # Extract metrics
-            messages_ready = queue.get('messages_ready', 0)
-            messages_unacked = queue.get('messages_unacknowledged', 0)
-            consumers = queue.get('consumers', 0)
-            
-            message_stats = queue.get('message_stats', {})
-            publish_rate = message_stats.get('publish_details', {}).get('rate', 0)
-            deliver_rate = message_stats.get('deliver_get_details', {}).get('rate', 0)
-            
-            # Get simple status
-            status_icon = self.get_queue_status_icon(queue, queue_name)
-            status, lag, status_desc = self.categorize_queue_status(queue)
-            
+            category = self._queue_category.get(queue_name, 'SUPPORT')
+
+            # Unpack the nested payload once; everything below reads the
+            # flat QStat instead of re-walking the dicts
+            stat = _to_qstat(queue)
+
+            # Get simple status; classify once and stash on the stat so
+            # the alert checks below reuse it
+            status_icon = self.get_queue_status_icon(stat, queue_name)
+            stat.status, stat.lag, stat.desc = self.categorize_queue_status(stat)
+            status = stat.status
+
             # Track healthy CORE queues (simple logic)
             if category == "CORE" and status_icon == "HEALTHY":
                 core_healthy += 1
-            
-            total_backlog += messages_ready
-            
+
+            total_backlog += stat.ready
+
             # Enhanced console output with rate information
-            logger.info(f"{status_icon:<12} {queue_name:<25} | "
-                       f"Ready: {messages_ready:>6} | "
-                       f"Consumers: {consumers:>2} | "
-                       f"Rate: {publish_rate:>5.1f}/s | "
-                       f"Status: {status}")
-            
+            if log_info:
+                logger.info("%-12s %-25s | Ready: %6d | Consumers: %2d | Rate: %5.1f/s | Status: %s",
+                            status_icon, queue_name, stat.ready, stat.consumers,
+                            stat.publish_rate, status)
+
             # Check for alerts
-            self.check_queue_alerts(queue_name, queue)
+            self.check_queue_alerts(queue_name, stat)
         
-        logger.info("=" * 90)
-        logger.info(f"Total Backlog: {total_backlog:,} messages")
-        logger.info(f"CORE Queues Healthy: {core_healthy}/{total_core}")
+        if log_info:
+            logger.info(_LOG_RULE)
+            logger.info("Total Backlog: %s messages", format(total_backlog, ','))
+            logger.info("CORE Queues Healthy: %d/%d", core_healthy, total_core)
         
         # NEW: Store metrics in InfluxDB
         if self.influx_writer:
@@ -626,9 +1059,13 @@ class ProductionGPSMonitor:
                 logger.error(f"Failed to store metrics in InfluxDB: {e}")
         
         # System-wide alerts
-        self.check_system_alerts(total_backlog, core_healthy, total_core)
-    
-    def check_system_alerts(self, total_backlog: int, core_healthy: int, total_core: int):
+        self.check_system_alerts(total_backlog, core_healthy, total_core, queue_data)
+
+        # One batched flush for everything this cycle fired
+        self.flush_discord_alerts()
+
+    def check_system_alerts(self, total_backlog: int, core_healthy: int, total_core: int,
+                            queue_data: Dict[str, Dict]):
         """Check for system-wide alert conditions"""
         
         # System-wide high backlog
@@ -642,28 +1079,28 @@ class ProductionGPSMonitor:
                     "alert_type": "system_backlog",
                     "status": "firing",
                     "value": f"{total_backlog:,} messages",
-                    "affected_queues": f"{len(self.target_queues)}",
+                    "affected_queues": f"{sum(1 for q in self.target_queues if q in queue_data)}",
                     "system": "RMQ-Queue"
                 }
-                self.send_discord_alert(alert_data)
+                self.queue_discord_alert(alert_data)
         
-        # Critical system failure
-        if total_core > 0:
+        # Critical system failure: integer compare (healthy < 50% of
+        # CORE) keeps the every-cycle check division-free
+        if total_core > 0 and core_healthy * 2 < total_core:
             core_health_ratio = core_healthy / total_core
-            if core_health_ratio < 0.5:
-                alert_key = "critical_system_failure"
-                if self.should_send_alert(alert_key):
-                    alert_data = {
-                        "alert_name": "Critical System Failure",
-                        "description": f"SYSTEM FAILURE\n\nOnly **{core_healthy}/{total_core}** CORE Queue queues are healthy!\n\nImmediate attention required.\n\nImpact: Severe service degradation",
-                        "severity": "critical",
-                        "alert_type": "system_failure",
-                        "status": "firing",
-                        "value": f"{core_healthy}/{total_core} healthy",
-                        "system_health": f"{core_health_ratio*100:.0f}%",
-                        "system": "RMQ-Queue"
-                    }
-                    self.send_discord_alert(alert_data)
+            alert_key = "critical_system_failure"
+            if self.should_send_alert(alert_key):
+                alert_data = {
+                    "alert_name": "Critical System Failure",
+                    "description": f"SYSTEM FAILURE\n\nOnly **{core_healthy}/{total_core}** CORE Queue queues are healthy!\n\nImmediate attention required.\n\nImpact: Severe service degradation",
+                    "severity": "critical",
+                    "alert_type": "system_failure",
+                    "status": "firing",
+                    "value": f"{core_healthy}/{total_core} healthy",
+                    "system_health": f"{core_health_ratio*100:.0f}%",
+                    "system": "RMQ-Queue"
+                }
+                self.queue_discord_alert(alert_data)
     
     def send_startup_notification(self):
         """Send startup notification to Discord"""
@@ -702,32 +1139,33 @@ class ProductionGPSMonitor:
     def reload_configuration(self):
         """Reload configuration from file"""
         try:
-            logger.info("Reloading queue configuration...")
-            
-            # Store old configuration for comparison
-            old_core = set(self.core_queues)
-            old_support = set(self.support_queues)
+            # The category map is rebuilt by parse_queue_configuration,
+            # so holding the old reference is enough for the diff
+            old_categories = self._queue_category
             old_targets = set(self.target_queues)
-            
-            # Load new configuration
-            self.load_configuration()
-            
-            # Compare changes
-            new_core = set(self.core_queues)
-            new_support = set(self.support_queues)
+
+            # Load new configuration; a whitespace-only or spurious FS
+            # event leaves the bytes unchanged, and then there is
+            # nothing to diff, prune, or announce
+            if not self.load_configuration():
+                return
+            logger.info("Reloading queue configuration...")
+
+            # Drop tracked alert state for queues no longer monitored
+            self.recovery_tracker.prune(2 * self.alert_cooldown, self._target_queue_set)
+
+            # Compare changes: one dict lookup per side instead of
+            # membership tests against the core sets per queue
+            new_categories = self._queue_category
             new_targets = set(self.target_queues)
-            
-            # Report changes
+
             added_queues = new_targets - old_targets
             removed_queues = old_targets - new_targets
-            category_changes = []
-            
-            # Check for category changes
-            for queue in old_targets & new_targets:
-                old_cat = "CORE" if queue in old_core else "SUPPORT"
-                new_cat = "CORE" if queue in new_core else "SUPPORT"
-                if old_cat != new_cat:
-                    category_changes.append(f"{queue}: {old_cat}→{new_cat}")
+            category_changes = [
+                f"{queue}: {old_categories[queue]}→{new_categories[queue]}"
+                for queue in old_targets & new_targets
+                if old_categories[queue] != new_categories[queue]
+            ]
             
             changes = []
             if added_queues:
@@ -739,7 +1177,7 @@ class ProductionGPSMonitor:
             
             if changes:
                 change_summary = "; ".join(changes)
-                logger.info(f"Configuration changes: {change_summary}")
+                logger.info("Configuration changes: %s", change_summary)
                 
                 # Send Discord notification about config change
                 alert_data = {
@@ -751,7 +1189,9 @@ class ProductionGPSMonitor:
                     "value": change_summary,
                     "system": "Queue Monitoring"
                 }
-                self.send_discord_alert(alert_data)
+                # Reload bursts (editor saves, git pull) should not
+                # serialize webhook round trips on the watcher thread
+                self.discord_sender.enqueue_alert(alert_data)
             else:
                 logger.info("Configuration reloaded - no changes detected")
                 
@@ -763,6 +1203,9 @@ class ProductionGPSMonitor:
         try:
             logger.info("Starting cleanup process...")
             
+            if hasattr(self, 'config_handler'):
+                self.config_handler.cancel()
+
             if hasattr(self, 'observer'):
                 self.observer.stop()
                 self.observer.join()
@@ -776,7 +1219,18 @@ class ProductionGPSMonitor:
             if hasattr(self, 'influx_writer') and self.influx_writer:
                 self.influx_writer.close()
                 logger.info("InfluxDB connection closed")
-            
+
+            if hasattr(self, 'http'):
+                self.http.close()
+                logger.info("RabbitMQ HTTP session closed")
+
+            # Drain the sender's batch buffer before anything else is
+            # announced; the flush timer is a daemon thread and anything
+            # still in the window would die with the process
+            if hasattr(self, 'discord_sender'):
+                self.discord_sender.close()
+                logger.info("Discord sender drained")
+
             # Send shutdown notification
             self.send_shutdown_notification()
             logger.info("Shutdown notification sent")
@@ -797,7 +1251,7 @@ class ProductionGPSMonitor:
         
         # Test connectivity
         try:
-            response = requests.get(f"{self.rabbitmq_url}/api/overview", auth=self.auth, timeout=10)
+            response = self.http.get(f"{self.rabbitmq_url}/api/overview", timeout=(2, 10))
             response.raise_for_status()
             logger.info("Successfully connected to target RabbitMQ")
         except Exception as e:
@@ -823,21 +1277,31 @@ class ProductionGPSMonitor:
         logger.info("Press Ctrl+C to stop...")
         
         try:
+            # Anchor the cadence on a monotonic next-tick target so the
+            # interval doesn't drift by each cycle's own duration
+            next_tick = time.monotonic()
             while True:
-                start_time = time.time()
-                
+                start_time = time.monotonic()
+
                 try:
                     self.collect_metrics()
                 except Exception as e:
                     logger.error(f"Error in metrics collection: {e}")
-                
-                # Calculate sleep time to maintain interval
-                elapsed = time.time() - start_time
-                sleep_time = max(0, self.collection_interval - elapsed)
-                
+
+                next_tick += self.collection_interval
+                now = time.monotonic()
+                sleep_time = next_tick - now
+
                 if sleep_time > 0:
                     time.sleep(sleep_time)
+                elif sleep_time < -self.collection_interval:
+                    # More than a full interval behind - re-anchor rather
+                    # than firing a catch-up burst of back-to-back cycles
+                    elapsed = now - start_time
+                    logger.warning(f"Metrics collection took {elapsed:.1f}s (longer than {self.collection_interval}s interval) - resetting schedule")
+                    next_tick = now
                 else:
+                    elapsed = now - start_time
                     logger.warning(f"Metrics collection took {elapsed:.1f}s (longer than {self.collection_interval}s interval)")
                 
         except KeyboardInterrupt:
@@ -875,8 +1339,6 @@ def main():
     log_format = os.getenv('LOG_FORMAT', 'json')
     
     if log_format.lower() == 'json':
-        import json as json_lib
-        
         class JSONFormatter(logging.Formatter):
             def format(self, record):
                 log_entry = {
@@ -890,7 +1352,11 @@ def main():
                 }
                 if record.exc_info:
                     log_entry['exception'] = self.formatException(record.exc_info)
-                return json_lib.dumps(log_entry)
+                # C-level encoder keeps per-record cost low under the
+                # chatty per-queue INFO logging in collect_metrics
+                if orjson is not None:
+                    return orjson.dumps(log_entry).decode()
+                return json.dumps(log_entry)
         
         handler = logging.StreamHandler()
         handler.setFormatter(JSONFormatter())
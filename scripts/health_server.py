@@ -6,15 +6,41 @@ Provides health check endpoints for production monitoring
 
 import os
 import json
+import time
 import requests
 import threading
 import logging
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+def _iso_now(_cache=[0, ""]):
+    """UTC ISO timestamp cached per second
+
+    Probe responses only carry second granularity anyway, so datetime
+    construction happens once per second regardless of probe rate.
+    """
+    t = int(time.time())
+    if t != _cache[0]:
+        _cache[0] = t
+        _cache[1] = datetime.utcfromtimestamp(t).isoformat()
+    return _cache[1]
+
+
+def _dumps(data) -> bytes:
+    """Serialize a response body to pretty-printed JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+
 class HealthCheckHandler(BaseHTTPRequestHandler):
     """HTTP request handler for health check endpoints"""
     
@@ -37,7 +63,7 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             health_data = {
                 "status": "healthy",
                 "service": "gps-production-monitor",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _iso_now(),
                 "version": "2.0",
                 "mode": "discord_only",
                 "target": f"{self.monitor.rabbitmq_host}:{self.monitor.rabbitmq_port}",
@@ -53,7 +79,7 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             self.send_response(200)
             self.send_header("Content-Type", "application/json")
             self.end_headers()
-            self.wfile.write(json.dumps(health_data, indent=2).encode())
+            self.wfile.write(_dumps(health_data))
             
         except Exception as e:
             logger.error(f"Health check error: {e}")
@@ -62,27 +88,36 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
     def _handle_readiness_check(self):
         """Handle /ready endpoint"""
         try:
-            # Test RabbitMQ connectivity
-            response = requests.get(
-                f"{self.monitor.rabbitmq_url}/api/overview",
-                auth=self.monitor.auth,
-                timeout=5
-            )
-            response.raise_for_status()
-            
+            # The monitoring loop already talks to RabbitMQ every cycle;
+            # a fresh-enough success there answers the probe without a
+            # second round trip to the management API
+            last_ok = getattr(self.monitor, 'last_rabbitmq_ok', 0.0)
+            interval = getattr(self.monitor, 'collection_interval', 0)
+            if not (last_ok and time.monotonic() - last_ok < 2 * interval):
+                # Stale or never polled - fall back to an active probe
+                # over the monitor's pooled session (kept-alive TCP
+                # connection instead of a fresh handshake per probe)
+                session = getattr(self.monitor, 'http', requests)
+                response = session.get(
+                    f"{self.monitor.rabbitmq_url}/api/overview",
+                    auth=self.monitor.auth,
+                    timeout=5
+                )
+                response.raise_for_status()
+
             # Success - ready
             status_data = {
                 "status": "ready",
                 "target_reachable": True,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _iso_now(),
                 "target": f"{self.monitor.rabbitmq_host}:{self.monitor.rabbitmq_port}",
-                "last_check": datetime.utcnow().isoformat()
+                "last_check": _iso_now()
             }
             
             self.send_response(200)
             self.send_header("Content-Type", "application/json")
             self.end_headers()
-            self.wfile.write(json.dumps(status_data, indent=2).encode())
+            self.wfile.write(_dumps(status_data))
             
         except Exception as e:
             # Failed - not ready
@@ -91,7 +126,7 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             status_data = {
                 "status": "not_ready",
                 "target_reachable": False,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _iso_now(),
                 "error": str(e),
                 "target": f"{self.monitor.rabbitmq_host}:{self.monitor.rabbitmq_port}"
             }
@@ -99,7 +134,7 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             self.send_response(503)
             self.send_header("Content-Type", "application/json")
             self.end_headers()
-            self.wfile.write(json.dumps(status_data, indent=2).encode())
+            self.wfile.write(_dumps(status_data))
     
     def _handle_not_found(self):
         """Handle 404 responses"""
@@ -110,10 +145,10 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
         error_data = {
             "error": "Not Found",
             "message": "Available endpoints: /health, /ready",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _iso_now()
         }
         
-        self.wfile.write(json.dumps(error_data, indent=2).encode())
+        self.wfile.write(_dumps(error_data))
     
     def _send_error_response(self, status_code: int, message: str):
         """Send error response"""
@@ -123,10 +158,10 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
         
         error_data = {
             "error": message,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _iso_now()
         }
         
-        self.wfile.write(json.dumps(error_data, indent=2).encode())
+        self.wfile.write(_dumps(error_data))
     
     def log_message(self, format, *args):
         """Suppress HTTP server access logs"""
@@ -152,7 +187,10 @@ class HealthServer:
         """Start health check server in background thread"""
         try:
             handler_class = self.create_handler()
-            self.server = HTTPServer(("", self.port), handler_class)
+            # Threading server: a /ready probe stalled on RabbitMQ (up to
+            # 5s) must not queue a concurrent liveness /health behind it
+            self.server = ThreadingHTTPServer(("", self.port), handler_class)
+            self.server.daemon_threads = True
             
             self.server_thread = threading.Thread(
                 target=self.server.serve_forever,
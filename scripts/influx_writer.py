@@ -10,12 +10,38 @@ from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List
 import re
 
-from influxdb_client import InfluxDBClient, Point, WritePrecision
-from influxdb_client.client.write_api import SYNCHRONOUS
+from influxdb_client import BucketRetentionRules, InfluxDBClient, WritePrecision
+from influxdb_client.client.write_api import WriteOptions
 
 logger = logging.getLogger(__name__)
 
 
+# Upper bound on the per-queue caches (categories, line prefixes)
+_CATEGORY_CACHE_MAX = 4096
+
+# Shared sentinel for absent nested payloads; avoids allocating a fresh
+# default dict per .get() on the per-tick extraction path
+_EMPTY = {}
+
+
+# CORE queue patterns compiled once at import; a single alternation means
+# one regex scan per categorization instead of a Python-level loop
+_CORE_PATTERN = re.compile("|".join(f"(?:{p})" for p in (
+    r'^gps_queue(?!_history).*',      # GPS queues except history
+    r'^current_position_queue.*',      # Real-time positioning
+    r'^bus_tracking_queue.*',          # Bus tracking
+    r'^pis_queue.*',                   # Passenger information
+)), re.IGNORECASE)
+
+
+def _escape_tag(value: str) -> str:
+    """Escape a tag value for InfluxDB line protocol"""
+    return (value.replace("\\", "\\\\")
+                 .replace(",", "\\,")
+                 .replace(" ", "\\ ")
+                 .replace("=", "\\="))
+
+
 class InfluxDBWriter:
     """Handles writing queue metrics to InfluxDB"""
     
@@ -33,6 +59,17 @@ class InfluxDBWriter:
         
         # Queue configuration cache
         self.queue_categories = {}
+
+        # Parsed config file cache, invalidated by mtime so a first tick
+        # with many new queues costs one read, not one per queue
+        self._config_cache = None
+        self._config_mtime = None
+
+        # Static line-protocol prefix per queue (measurement + tags); the
+        # tag set never changes between ticks, so only the field section
+        # is formatted per write
+        self._line_prefixes = {}
+        self._environment = _escape_tag(os.getenv("DEPLOYMENT_ENVIRONMENT", "production"))
         
         self.initialize_client()
     
@@ -46,13 +83,24 @@ class InfluxDBWriter:
                 timeout=30000  # 30 second timeout
             )
             
-            self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
+            # Batching write API: points accumulate client-side and flush
+            # as one request per batch/interval, so the collection loop
+            # never blocks on the InfluxDB round trip
+            self.write_api = self.client.write_api(write_options=WriteOptions(
+                batch_size=500,
+                flush_interval=10_000,
+                retry_interval=5_000,
+                max_retries=3
+            ))
             self.query_api = self.client.query_api()
             
             # Test connection
             health = self.client.health()
             if health.status == "pass":
                 logger.info(f"InfluxDB connection successful: {self.url}")
+                self.ensure_bucket_retention(
+                    int(os.getenv('INFLUXDB_RETENTION_DAYS', 30))
+                )
             else:
                 logger.error(f"InfluxDB health check failed: {health.status}")
                 
@@ -66,70 +114,83 @@ class InfluxDBWriter:
             logger.warning("No queue data to write")
             return
         
-        points = []
-        timestamp = datetime.now(timezone.utc)
-        
-        for queue_name, metrics in queue_data.items():
-            try:
-                # Determine queue category
-                category = self.get_queue_category(queue_name)
-                
-                # Extract metrics with safe defaults
-                messages_ready = metrics.get('messages_ready', 0)
-                messages_unacked = metrics.get('messages_unacknowledged', 0)
-                consumers = metrics.get('consumers', 0)
-                
-                # Extract rate information
-                message_stats = metrics.get('message_stats', {})
-                publish_rate = message_stats.get('publish_details', {}).get('rate', 0.0)
-                deliver_rate = message_stats.get('deliver_get_details', {}).get('rate', 0.0)
-                ack_rate = message_stats.get('ack_details', {}).get('rate', 0.0)
-                
-                # Create InfluxDB point
-                point = Point("queue_metrics") \
-                    .tag("queue_name", queue_name) \
-                    .tag("category", category) \
-                    .tag("environment", os.getenv("DEPLOYMENT_ENVIRONMENT", "production")) \
-                    .field("messages_ready", int(messages_ready)) \
-                    .field("messages_unacked", int(messages_unacked)) \
-                    .field("consumer_count", int(consumers)) \
-                    .field("incoming_rate", float(publish_rate)) \
-                    .field("consume_rate", float(deliver_rate)) \
-                    .field("ack_rate", float(ack_rate)) \
-                    .time(timestamp, WritePrecision.S)
-                
-                # Add derived metrics
-                total_messages = messages_ready + messages_unacked
-                net_rate = deliver_rate - publish_rate
-                processing_lag = messages_ready / deliver_rate if deliver_rate > 0 else 0
-                
-                point = point \
-                    .field("total_messages", int(total_messages)) \
-                    .field("net_rate", float(net_rate)) \
-                    .field("processing_lag_seconds", float(processing_lag))
-                
-                points.append(point)
-                
-                logger.debug(f"Prepared metrics point for {queue_name}: "
-                           f"ready={messages_ready}, consumers={consumers}, "
-                           f"rates=in:{publish_rate:.1f}/out:{deliver_rate:.1f}")
-                
-            except Exception as e:
-                logger.error(f"Error preparing metrics for queue {queue_name}: {e}")
-                continue
-        
-        # Batch write to InfluxDB
-        if points:
+        timestamp = int(datetime.now(timezone.utc).timestamp())
+
+        # Errors here are rare (the payload shape comes straight from the
+        # management API), so run the batch without a per-queue handler
+        # and only fall back to item-by-item recovery if something raises
+        try:
+            lines = [
+                self._build_line(queue_name, metrics, timestamp)
+                for queue_name, metrics in queue_data.items()
+            ]
+        except Exception as e:
+            logger.error(f"Error preparing metrics batch: {e} - retrying per queue")
+            lines = []
+            for queue_name, metrics in queue_data.items():
+                try:
+                    lines.append(self._build_line(queue_name, metrics, timestamp))
+                except Exception as e:
+                    logger.error(f"Error preparing metrics for queue {queue_name}: {e}")
+
+        # Hand the batch to the buffering write API; delivery happens on
+        # its background thread
+        if lines:
             try:
-                self.write_api.write(bucket=self.bucket, record=points)
-                logger.info(f"Successfully wrote {len(points)} metric points to InfluxDB")
-                
+                self.write_api.write(bucket=self.bucket, record=lines,
+                                     write_precision=WritePrecision.S)
+                logger.info(f"Queued {len(lines)} metric points for InfluxDB")
+
             except Exception as e:
                 logger.error(f"Failed to write metrics to InfluxDB: {e}")
                 raise
         else:
             logger.warning("No valid metrics points to write")
-    
+
+    def _build_line(self, queue_name: str, metrics: Dict[str, Any], timestamp: int) -> str:
+        """Build one line-protocol record for a queue's metrics"""
+        # Tag section is invariant across ticks; build it once per queue
+        # and reuse the cached prefix
+        prefix = self._line_prefixes.get(queue_name)
+        if prefix is None:
+            category = self.get_queue_category(queue_name)
+            prefix = self._line_prefixes[queue_name] = (
+                f"queue_metrics,queue_name={_escape_tag(queue_name)}"
+                f",category={category},environment={self._environment} "
+            )
+
+        # Extract metrics with safe defaults
+        messages_ready = int(metrics.get('messages_ready', 0))
+        messages_unacked = int(metrics.get('messages_unacknowledged', 0))
+        consumers = int(metrics.get('consumers', 0))
+
+        # Extract rate information; bind each level once instead of
+        # re-walking the nested dicts per rate
+        ms = metrics.get('message_stats') or _EMPTY
+        publish_rate = float((ms.get('publish_details') or _EMPTY).get('rate', 0.0))
+        deliver_rate = float((ms.get('deliver_get_details') or _EMPTY).get('rate', 0.0))
+        ack_rate = float((ms.get('ack_details') or _EMPTY).get('rate', 0.0))
+
+        # Derived metrics
+        total_messages = messages_ready + messages_unacked
+        net_rate = deliver_rate - publish_rate
+        processing_lag = messages_ready / deliver_rate if deliver_rate > 0 else 0.0
+
+        # Emit line protocol directly: one string format replaces the
+        # dozen builder-chain calls and allocations per point
+        return (
+            f"{prefix}messages_ready={messages_ready}i"
+            f",messages_unacked={messages_unacked}i"
+            f",consumer_count={consumers}i"
+            f",incoming_rate={publish_rate}"
+            f",consume_rate={deliver_rate}"
+            f",ack_rate={ack_rate}"
+            f",total_messages={total_messages}i"
+            f",net_rate={net_rate}"
+            f",processing_lag_seconds={processing_lag}"
+            f" {timestamp}"
+        )
+
     def get_queue_category(self, queue_name: str) -> str:
         """Determine queue category (CORE/SUPPORT)"""
         
@@ -143,47 +204,47 @@ class InfluxDBWriter:
         if not category:
             # Pattern-based categorization
             category = self.categorize_by_pattern(queue_name)
-        
-        # Cache the result
+
+        # Cache the result; cap growth so churning dynamic queue names
+        # (amq.gen-*) can't leak memory over weeks of runtime. A rare
+        # full reset repopulates within one tick and beats per-lookup
+        # LRU bookkeeping.
+        if len(self.queue_categories) >= _CATEGORY_CACHE_MAX:
+            self.queue_categories.clear()
+            self._line_prefixes.clear()
         self.queue_categories[queue_name] = category
         return category
     
     def get_category_from_config(self, queue_name: str) -> str:
-        """Get category from configuration file"""
+        """Get category from configuration file (cached until mtime changes)"""
         try:
             import json
             config_file = os.getenv('QUEUE_CONFIG_FILE', 'config/queues.json')
-            
-            if os.path.exists(config_file):
+
+            mtime = os.stat(config_file).st_mtime_ns
+            if mtime != self._config_mtime:
                 with open(config_file, 'r') as f:
-                    config = json.load(f)
-                    
-                queues = config.get('queue_monitoring', {}).get('queues', {})
-                if queue_name in queues:
-                    return queues[queue_name].get('category', 'SUPPORT')
-                    
+                    self._config_cache = json.load(f)
+                self._config_mtime = mtime
+                # Drop pattern-derived entries so edits take effect
+                self.queue_categories.clear()
+                self._line_prefixes.clear()
+
+            queues = self._config_cache.get('queue_monitoring', {}).get('queues', {})
+            if queue_name in queues:
+                return queues[queue_name].get('category', 'SUPPORT')
+
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.debug(f"Could not load category from config: {e}")
-        
+
         return None
     
     def categorize_by_pattern(self, queue_name: str) -> str:
         """Categorize queue based on naming patterns"""
-        
-        # CORE queue patterns (critical for operations)
-        core_patterns = [
-            r'^gps_queue(?!_history).*',      # GPS queues except history
-            r'^current_position_queue.*',      # Real-time positioning
-            r'^bus_tracking_queue.*',          # Bus tracking
-            r'^pis_queue.*',                   # Passenger information
-        ]
-        
-        for pattern in core_patterns:
-            if re.match(pattern, queue_name, re.IGNORECASE):
-                return "CORE"
-        
-        # Everything else is SUPPORT
-        return "SUPPORT"
+        # Everything that doesn't match a CORE pattern is SUPPORT
+        return "CORE" if _CORE_PATTERN.match(queue_name) else "SUPPORT"
     
     def health_check(self) -> bool:
         """Check InfluxDB connection health"""
@@ -219,12 +280,44 @@ class InfluxDBWriter:
             logger.error(f"Error getting database size: {e}")
             return 0.0
     
+    def ensure_bucket_retention(self, retention_days: int = 30):
+        """Configure bucket retention so expiry runs in the storage engine
+
+        A retention rule makes InfluxDB drop old data during background
+        compaction, replacing the client-side full-range delete sweep.
+        """
+        try:
+            buckets_api = self.client.buckets_api()
+            bucket = buckets_api.find_bucket_by_name(self.bucket)
+            if bucket is None:
+                logger.warning(f"Bucket {self.bucket} not found - cannot set retention")
+                return
+
+            every_seconds = retention_days * 86400
+            rules = bucket.retention_rules or []
+            if len(rules) == 1 and rules[0].every_seconds == every_seconds:
+                return  # Already configured
+
+            bucket.retention_rules = [
+                BucketRetentionRules(type='expire', every_seconds=every_seconds)
+            ]
+            buckets_api.update_bucket(bucket)
+            logger.info(f"Bucket retention set to {retention_days} days")
+
+        except Exception as e:
+            logger.error(f"Error configuring bucket retention: {e}")
+
     def cleanup_old_data(self, retention_days: int = 30):
-        """Clean up data older than retention period"""
+        """Clean up data older than retention period
+
+        Kept as a one-off migration path for data written before the
+        bucket retention rule existed; new deployments only need
+        ensure_bucket_retention.
+        """
         try:
             cutoff_time = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
             cutoff_time = cutoff_time - timedelta(days=retention_days)
-            
+
             delete_api = self.client.delete_api()
             delete_api.delete(
                 start=datetime(1970, 1, 1, tzinfo=timezone.utc),
@@ -233,14 +326,17 @@ class InfluxDBWriter:
                 bucket=self.bucket,
                 org=self.org
             )
-            
+
             logger.info(f"Cleaned up data older than {retention_days} days")
-            
+
         except Exception as e:
             logger.error(f"Error cleaning up old data: {e}")
     
     def close(self):
         """Close InfluxDB client connections"""
+        if self.write_api:
+            # Flush anything still buffered before tearing the client down
+            self.write_api.close()
         if self.client:
             self.client.close()
             logger.info("InfluxDB client closed")